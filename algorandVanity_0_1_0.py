@@ -1,7 +1,34 @@
-from algosdk import account, mnemonic
+from algosdk import account, encoding, mnemonic
+from nacl.bindings import crypto_sign_seed_keypair
+from nacl.signing import SigningKey
 from tqdm import tqdm
+import argparse
+import base64
+import collections
+import hashlib
+import heapq
+import itertools
 import json
+import math
+import mmap
+import multiprocessing as mp
 import os
+import queue
+import signal
+import socket
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # The vectorised matcher is optional
+    np = None
+
+try:
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+    from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+except ImportError:  # The cryptography keygen backend is optional
+    Ed25519PrivateKey = None
 
 def display_logo():
     """Display ASCII art of the Algorand logo at startup."""
@@ -45,8 +72,45 @@ def display_logo():
     print(logo)
 
 ALGORAND_ADDRESS_LENGTH = 58
-VALID_CHARS = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ234567")
+ADDRESS_BITS = 290  # Bits behind the 58 characters: 32 byte key, 4 byte checksum and 2 zero bits
+KEY_CHARS = 51  # Leading characters that only depend on the public key
+BASE32_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+BASE32_PAIRS = [a + b for a in BASE32_ALPHABET for b in BASE32_ALPHABET]
+PAIR_SHIFTS = tuple(range(280, -1, -10))  # 29 pairs of characters make up an address
+VALID_CHARS = set(BASE32_ALPHABET)
 VALID_END_CHARS = {'I', 'Y', 'Q', 'U', 'A', '4', 'M', 'E'}
+HAVE_SHA512_256 = "sha512_256" in hashlib.algorithms_available
+SEED_LENGTH = 32
+KEYGEN_BATCH = 256  # Keypairs generated per batch
+PATTERN_DISPLAY_LIMIT = 20  # Patterns drawn by display_pattern_visual before summarising
+WORDLIST_MIN_LENGTH = 4
+ANYWHERE_SCAN_LIMIT = 8  # Below this many Anywhere terms, substring checks beat the automaton
+VECTOR_BATCH = 4096  # Keypairs per batch when matching with NumPy
+CHECKPOINT_INTERVAL = 30  # Seconds between checkpoints and match store syncs
+REPORT_QUEUE_SIZE = 10000  # Matches waiting for the reporter before the search has to wait
+MAX_DISPLAYED_MATCHES = 5  # Matches printed per second before the rest are only counted
+RATE_SAMPLE_SECONDS = 1.0  # How long the search speed is measured for before a search
+PROGRESS_REFRESH = 0.5  # Seconds between progress bar redraws
+PROGRESS_MESSAGE_INTERVAL = 1.0  # Seconds between a worker's progress messages while it finds nothing
+PROGRESS_LOG_INTERVAL = 60  # Seconds between progress lines in quiet mode
+WORKER_STOP_TIMEOUT = 30  # Seconds a stopping search waits for workers to send their last batch
+PROGRESS_TOP_PATTERNS = 3  # Patterns with the most matches named in the progress line
+METRICS_INTERVAL = 10  # Seconds between metrics exports
+METRIC_STAGES = ("seed", "keygen", "match")
+CORPUS_MAGIC = b"AVCORPUS"
+CORPUS_VERSION = 1
+CORPUS_HEADER_LENGTH = 64
+CORPUS_RECORD_LENGTH = 68  # seed, public key and checksum of one address
+CORPUS_ENCRYPTED = 0x01
+CORPUS_BATCH = 65536  # Records matched per batch when searching a corpus
+UNIT_SIZE = 10000000  # Addresses per work unit in a shared job directory
+STALE_CLAIM_SECONDS = 300  # A claimed unit whose checkpoint is older than this goes back to the queue
+COORDINATOR_POLL = 5  # Seconds between coordinator status updates
+EXPANSION_LIMIT = 4096  # Most literal strings a wildcard term may be searched as
+CALIBRATE_SECONDS = 2.0  # How long each setting is measured for by --calibrate
+CALIBRATE_SCALAR_BATCHES = (64, 256, 1024)
+CALIBRATE_VECTOR_BATCHES = (1024, 4096, 16384)
+PROFILE_FILE = os.path.join(os.path.expanduser("~"), ".algorandVanityProfile.json")
 
 def load_search_terms_file():
     """Load search terms from a JSON file."""
@@ -60,66 +124,110 @@ def load_search_terms_file():
             print(f"Error: File '{filename}' not found.")
             continue
             
-        try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-                
-            if "search_terms" not in data:
-                print("Error: File must contain a 'search_terms' array.")
-                continue
-                
-            terms = []
-            nums = []
-            positions = []
-            exclude_lasts = []
-            
-            for term_data in data["search_terms"]:
-                if term_data["position"] == "FB":
-                    # Handle Front & Back combination
-                    terms.extend([f"F&B:{term_data['front_term']}", term_data['back_term']])
-                    nums.extend([term_data['front_digits'], term_data['back_digits']])
-                    positions.extend(["F", "B"])
-                    exclude_lasts.extend([False, term_data['exclude_last']])
-                else:
-                    # Handle single position terms
-                    terms.append(term_data["term"])
-                    nums.append(term_data["digits"])
-                    positions.append(term_data["position"])
-                    exclude_lasts.append(term_data.get("exclude_last", False))
-            
-            # Validate the loaded terms
-            for i, (term, num, pos) in enumerate(zip(terms, nums, positions)):
-                if not validate_search_term(term):
-                    print(f"Error: Invalid characters in term '{term}'")
-                    return None
-                    
-                if len(term) != num:
-                    print(f"Error: Term '{term}' length doesn't match specified digits {num}")
-                    return None
-                    
-                if pos == "B" and not exclude_lasts[i]:
-                    valid, message = validate_end_chars(term)
-                    if not valid:
-                        print(f"Error in term '{term}': {message}")
-                        return None
-            
-            return terms, nums, positions, exclude_lasts
-            
-        except json.JSONDecodeError:
-            print("Error: Invalid JSON format in file.")
-        except KeyError as e:
-            print(f"Error: Missing required field {e} in search terms file.")
-        except Exception as e:
-            print(f"Error loading file: {str(e)}")
+        loaded = read_search_terms(filename)
+        if loaded:
+            return loaded
         
         retry = input("Would you like to try another file? (Y/N): ").upper()
         if retry != "Y":
             return None
 
+def read_search_terms(filename):
+    """Read and validate a search terms JSON file into a SearchPlan without prompting, or return None."""
+    if not os.path.exists(filename):
+        print(f"Error: File '{filename}' not found.")
+        return None
+
+    try:
+        with open(filename, 'r') as f:
+            data = json.load(f)
+
+        if "search_terms" not in data:
+            print("Error: File must contain a 'search_terms' array.")
+            return None
+
+        plan = SearchPlan.from_json(data["search_terms"])
+    except json.JSONDecodeError:
+        print("Error: Invalid JSON format in file.")
+        return None
+    except KeyError as e:
+        print(f"Error: Missing required field {e} in search terms file.")
+        return None
+    except ValueError as e:
+        print(f"Error: {e}")
+        return None
+    except Exception as e:
+        print(f"Error loading file: {str(e)}")
+        return None
+
+    if not plan:
+        print(f"Error: No search terms in '{filename}'.")
+        return None
+    return plan
+
+
+def load_wordlist(filename, min_length, total_addresses):
+    """Load a wordlist as front and back search terms, skipping words no address can contain."""
+    if not os.path.exists(filename):
+        print(f"Error: File '{filename}' not found.")
+        return None
+
+    plan = SearchPlan()
+    seen = set()
+    skipped = 0
+    back_count = 0
+    lengths = []
+
+    try:
+        with open(filename, 'r', encoding="utf-8", errors="replace") as f:
+            for line in f:
+                word = line.strip().upper()
+                if not word or word in seen:
+                    continue
+                seen.add(word)
+
+                # Words are taken literally, so `?` and `[` are not allowed here
+                if (len(word) < min_length or len(word) > ALGORAND_ADDRESS_LENGTH
+                        or not all(c in VALID_CHARS for c in word)):
+                    skipped += 1
+                    continue
+
+                # The same word at the front and back is counted separately
+                plan.add("F", [word], label=f"{word} (front)")
+                lengths.append(len(word))
+
+                # Words are only searched at the back when an address can end with them
+                if validate_end_chars(word)[0]:
+                    plan.add("B", [word], label=f"{word} (back)")
+                    back_count += 1
+    except OSError as e:
+        print(f"Error loading file: {str(e)}")
+        return None
+
+    if not plan:
+        print(f"Error: No usable words of {min_length} or more characters in '{filename}'.")
+        return None
+
+    print("\n" + "="*60)
+    print("Wordlist Search Terms".center(60))
+    print("="*60)
+    if total_addresses is not None:
+        print("Total Addresses to Check: {:,}".format(total_addresses))
+        print("="*60)
+    print(f"Words Loaded: {len(lengths):,} (skipped {skipped:,})")
+    print(f"Front Terms: {len(lengths):,}")
+    print(f"Back Terms: {back_count:,} (words ending in {', '.join(sorted(VALID_END_CHARS))})")
+    print(f"Word Lengths: {min(lengths)} to {max(lengths)}")
+    print("="*60)
+    return plan
 
 def validate_search_term(term):
-    """Check if search term contains only valid base32 characters."""
-    return all(c in VALID_CHARS for c in term)
+    """Check if search term contains only valid base32 characters, `?` wildcards and `[..]` classes."""
+    try:
+        term_slots(term)
+    except ValueError:
+        return False
+    return True
 
 def validate_end_chars(term, exclude_last=False):
     """Validate if a term can appear at the end of an Algorand address."""
@@ -127,63 +235,276 @@ def validate_end_chars(term, exclude_last=False):
         return False, "Empty term"
     
     if not exclude_last:
-        last_char = term[-1]
-        if last_char not in VALID_END_CHARS:
+        last_slot = term_slots(term)[-1]
+        if not any(c in VALID_END_CHARS for c in last_slot):
             valid_ends = ", ".join(sorted(VALID_END_CHARS))
             return False, f"Warning: Address can only end with these characters: {valid_ends}"
     return True, None
 
-def display_pattern_visual(terms, nums, positions, exclude_lasts):
-    print("\nSearching for addresses with these patterns:")
-    print("-" * 70)
-    
+def term_slots(term):
+    """Split a search term into the characters allowed in each of its slots.
+
+    A plain character allows itself, `?` allows any character and `[A4]` allows
+    any one of the bracketed characters. Raises ValueError for malformed terms.
+    """
+    slots = []
     i = 0
-    while i < len(terms):
-        pattern = ["#"] * ALGORAND_ADDRESS_LENGTH
-        
-        if i+1 < len(positions) and positions[i] == "F" and positions[i+1] == "B" and terms[i].startswith("F&B:"):
-            front_term = terms[i][4:]
-            back_term = terms[i+1]
-            pattern[:len(front_term)] = front_term
-            if exclude_lasts[i+1]:
-                pattern[-len(back_term)-1:-1] = back_term
+    while i < len(term):
+        c = term[i]
+        if c == "?":
+            slots.append(BASE32_ALPHABET)
+        elif c == "[":
+            end = term.find("]", i + 1)
+            if end == -1:
+                raise ValueError(f"Unclosed '[' in term '{term}'")
+            chars = term[i+1:end]
+            if not chars or not all(ch in VALID_CHARS for ch in chars):
+                raise ValueError(f"Character class '[{chars}]' in term '{term}' must list base32 characters")
+            slots.append("".join(ch for ch in BASE32_ALPHABET if ch in chars))
+            i = end
+        elif c in VALID_CHARS:
+            slots.append(c)
+        else:
+            raise ValueError(f"Invalid character '{c}' in term '{term}'")
+        i += 1
+    return slots
+
+def term_length(term):
+    """Return how many address characters a term covers."""
+    return len(term_slots(term))
+
+def is_literal(term):
+    """Check if a term is a plain string, without wildcards or character classes."""
+    return "?" not in term and "[" not in term
+
+def check_expansion(term, wildcards=True):
+    """Return how many plain strings a term is searched as. Raises ValueError past EXPANSION_LIMIT.
+
+    Anywhere terms are expanded in full, so each `?` counts as every character. Anchored
+    terms leave `?` to a bit mask (wildcards=False) and only their classes multiply.
+    """
+    combinations = math.prod(len(slot) for slot in term_slots(term)
+                             if wildcards or len(slot) < len(BASE32_ALPHABET))
+    if combinations > EXPANSION_LIMIT:
+        raise ValueError(f"Term '{term}' stands for {combinations:,} strings, "
+                         f"more than the {EXPANSION_LIMIT:,} it can be searched for at once")
+    return combinations
+
+def expand_term(term):
+    """Return every plain string a term stands for. Raises ValueError past EXPANSION_LIMIT."""
+    check_expansion(term)
+    return ["".join(chars) for chars in itertools.product(*term_slots(term))]
+
+def term_pattern(term):
+    """Return the term as one display character per slot: `?` for any character, `*` for a class."""
+    return ["?" if len(slot) == len(BASE32_ALPHABET) else "*" if len(slot) > 1 else slot
+            for slot in term_slots(term)]
+
+def slots_match(text, slots):
+    """Check if every character of the text is allowed by its slot."""
+    return len(text) == len(slots) and all(c in slot for c, slot in zip(text, slots))
+
+def encode_target(term):
+    """Encode a term for matching: the term itself when plain, otherwise its tuple of slots."""
+    return term if is_literal(term) else tuple(term_slots(term))
+
+def target_matches(text, target):
+    """Check if a slice of an address spells out an encoded target."""
+    if isinstance(target, str):
+        return text == target
+    return slots_match(text, target)
+
+def pattern_label(terms, exclude_last=False):
+    """Return the label a pattern is counted and reported under, unless it is given its own."""
+    label = " & ".join(terms)
+    return f"{label} (excl. last)" if exclude_last else label
+
+class SearchPattern:
+    """One search pattern, compiled once when the plan is built.
+
+    Anchored patterns keep a (start, stop, term, target) part for every term they pin
+    to the address, so matching is just slicing. Anywhere patterns keep the target to
+    look for at every position instead. Raises ValueError for malformed terms.
+    """
+    __slots__ = ("pattern_id", "position", "terms", "exclude_last", "label", "parts", "anywhere")
+
+    def __init__(self, pattern_id, position, terms, exclude_last=False, label=None):
+        if position not in ("F", "B", "A", "FB"):
+            raise ValueError(f"Unknown search position '{position}'")
+        self.pattern_id = pattern_id
+        self.position = position
+        self.terms = tuple(terms)
+        self.exclude_last = bool(exclude_last) and position in ("B", "FB")
+        self.anywhere = encode_target(self.terms[0]) if position == "A" else None
+        for term in self.terms:
+            # Checked here, so a term too wide to compile is rejected where it is entered
+            check_expansion(term, wildcards=position == "A")
+
+        parts = []
+        if position in ("F", "FB"):
+            front = self.terms[0]
+            parts.append((0, term_length(front), front, encode_target(front)))
+        if position in ("B", "FB"):
+            back = self.terms[-1]
+            stop = ALGORAND_ADDRESS_LENGTH - (1 if self.exclude_last else 0)
+            parts.append((stop - term_length(back), stop, back, encode_target(back)))
+        if any(start < 0 or stop > ALGORAND_ADDRESS_LENGTH for start, stop, _, _ in parts):
+            raise ValueError(f"Term '{' & '.join(self.terms)}' is longer than an address")
+        self.parts = tuple(parts)
+
+        self.label = label or pattern_label(self.terms, self.exclude_last)
+
+    @property
+    def front(self):
+        return self.terms[0] if self.position in ("F", "FB") else None
+
+    @property
+    def back(self):
+        return self.terms[-1] if self.position in ("B", "FB") else None
+
+class SearchPlan:
+    """Every search pattern in pattern id order, built once from JSON, a wordlist or the prompts.
+
+    Matchers, workers and reporters all work from the plan, and it pickles cheaply
+    to worker processes because the patterns are plain slotted records.
+    """
+    __slots__ = ("patterns", "labels")
+
+    def __init__(self):
+        self.patterns = []
+        self.labels = []
+
+    def add(self, position, terms, exclude_last=False, label=None):
+        """Compile and append a pattern, returning it."""
+        pattern = SearchPattern(len(self.patterns), position, terms, exclude_last, label)
+        self.patterns.append(pattern)
+        self.labels.append(pattern.label)
+        return pattern
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def __iter__(self):
+        return iter(self.patterns)
+
+    def __getitem__(self, pattern_id):
+        return self.patterns[pattern_id]
+
+    @classmethod
+    def from_json(cls, entries):
+        """Build a plan from `search_terms` entries in the searchAlgo.json format.
+
+        Raises ValueError for invalid terms and KeyError for missing fields.
+        """
+        if isinstance(entries, dict):
+            entries = upgrade_search_terms(entries)
+        plan = cls()
+        for entry in entries:
+            if entry["position"] == "FB":
+                terms = [(entry["front_term"], entry["front_digits"]), (entry["back_term"], entry["back_digits"])]
             else:
-                pattern[-len(back_term):] = back_term
-            print(f"Front & Back: {''.join(pattern)}")
+                terms = [(entry["term"], entry["digits"])]
+            for term, num in terms:
+                if not validate_search_term(term):
+                    raise ValueError(f"Invalid characters in term '{term}'")
+                if term_length(term) != num:
+                    raise ValueError(f"Term '{term}' length doesn't match specified digits {num}")
+            pattern = plan.add(entry["position"], [term for term, _ in terms], entry.get("exclude_last", False),
+                               entry.get("label"))
+            if pattern.back is not None and not validate_end_chars(pattern.back, pattern.exclude_last)[0]:
+                valid_ends = ", ".join(sorted(VALID_END_CHARS))
+                raise ValueError(f"Back term '{pattern.back}' can never match, "
+                                 f"addresses can only end with these characters: {valid_ends}")
+        return plan
+
+    def to_json(self):
+        """Return the plan as `search_terms` entries, to save in checkpoints and jobs."""
+        entries = []
+        for pattern in self.patterns:
+            if pattern.position == "FB":
+                entries.append({"position": "FB", "front_term": pattern.front,
+                                "front_digits": term_length(pattern.front), "back_term": pattern.back,
+                                "back_digits": term_length(pattern.back), "exclude_last": pattern.exclude_last})
+            else:
+                entries.append({"term": pattern.terms[0], "digits": term_length(pattern.terms[0]),
+                                "position": pattern.position, "exclude_last": pattern.exclude_last})
+            # Only labels that differ from the default are saved, such as a wordlist's
+            if pattern.label != pattern_label(pattern.terms, pattern.exclude_last):
+                entries[-1]["label"] = pattern.label
+        return entries
+
+def upgrade_search_terms(search_terms):
+    """Turn the parallel lists saved by older checkpoints into `search_terms` entries.
+
+    Those lists mark a front & back pair with an "F&B:" prefix on its front term.
+    """
+    terms = search_terms["terms"]
+    exclude_lasts = search_terms["exclude_lasts"]
+    entries = []
+    i = 0
+    while i < len(terms):
+        if terms[i].startswith("F&B:") and i + 1 < len(terms):
+            entries.append({"position": "FB", "front_term": terms[i][4:], "front_digits": search_terms["nums"][i],
+                            "back_term": terms[i+1], "back_digits": search_terms["nums"][i+1],
+                            "exclude_last": exclude_lasts[i+1]})
             i += 2
         else:
-            if positions[i] == "F":
-                pattern[:len(terms[i])] = terms[i]
-                print(f"Front:       {''.join(pattern)}")
-            elif positions[i] == "B":
-                if exclude_lasts[i]:
-                    pattern[-len(terms[i])-1:-1] = terms[i]
-                    print(f"Back (excluding last): {''.join(pattern)}")
-                else:
-                    pattern[-len(terms[i]):] = terms[i]
-                    print(f"Back:        {''.join(pattern)}")
-            elif positions[i] == "A":
-                print(f"Anywhere:    {terms[i]} (can appear anywhere in address)")
+            entries.append({"term": terms[i], "digits": search_terms["nums"][i],
+                            "position": search_terms["positions"][i], "exclude_last": exclude_lasts[i]})
             i += 1
+    return entries
+
+def pattern_visual(pattern, address=None):
+    """Draw where a pattern sits in an address, with `#` for the characters it leaves free.
+
+    Anywhere patterns are drawn where they first occur in the address, or not at all without one.
+    """
+    visual = ["#"] * ALGORAND_ADDRESS_LENGTH
+    parts = pattern.parts
+    if pattern.anywhere is not None and address is not None:
+        length = len(pattern.anywhere)
+        for start in range(ALGORAND_ADDRESS_LENGTH - length + 1):
+            if target_matches(address[start:start + length], pattern.anywhere):
+                parts = ((start, start + length, pattern.terms[0], pattern.anywhere),)
+                break
+    for start, stop, term, _ in parts:
+        visual[start:stop] = term_pattern(term)
+    return "".join(visual)
+
+def display_pattern_visual(plan):
+    print("\nSearching for addresses with these patterns:")
+    print("-" * 70)
+    
+    for pattern in plan.patterns[:PATTERN_DISPLAY_LIMIT]:
+        if pattern.position == "FB":
+            print(f"Front & Back: {pattern_visual(pattern)}")
+        elif pattern.position == "F":
+            print(f"Front:       {pattern_visual(pattern)}")
+        elif pattern.position == "B":
+            if pattern.exclude_last:
+                print(f"Back (excluding last): {pattern_visual(pattern)}")
+            else:
+                print(f"Back:        {pattern_visual(pattern)}")
+        else:
+            print(f"Anywhere:    {pattern.terms[0]} (can appear anywhere in address)")
+    if len(plan) > PATTERN_DISPLAY_LIMIT:
+        print(f"... and {len(plan) - PATTERN_DISPLAY_LIMIT:,} more search terms")
     print("-" * 70)
 
-def display_match(term, address, passphrase, found_count, exclude_last=False):
+def display_match(pattern, address, passphrase, found_count, also_matches=None):
     print("\n" + "="*70)
     print(f"Match #{found_count}".center(70))
     print("="*70)
-    print(f"Pattern: {term}")
+    print(f"Pattern: {pattern.label}")
+    if also_matches:
+        print(f"Also matches: {', '.join(also_matches)}")
     print("-"*70)
     print(f"Address:    {address}")
-    if exclude_last:
-        pattern = ['#'] * ALGORAND_ADDRESS_LENGTH
-        pattern[-len(term)-1:-1] = term
-        print(f"Pattern:    {''.join(pattern)}")
-    else:
-        print(f"Pattern:    {'#'*(ALGORAND_ADDRESS_LENGTH-len(term))}{term}")
+    print(f"Pattern:    {pattern_visual(pattern, address)}")
     print(f"Passphrase: {passphrase}")
     print("="*70)
 
-def display_search_terms(terms, nums, positions, exclude_lasts, total_addresses):
+def display_search_terms(plan, total_addresses):
     print("\n" + "="*60)
     print("Current Search Terms".center(60))
     print("="*60)
@@ -192,69 +513,637 @@ def display_search_terms(terms, nums, positions, exclude_lasts, total_addresses)
     print("| {:<15} | {:<8} | {:<25} |".format("String", "Length", "Location"))
     print("-"*60)
     
-    i = 0
-    while i < len(terms):
-        if i+1 < len(positions) and positions[i] == "F" and positions[i+1] == "B" and terms[i].startswith("F&B:"):
-            combined_term = terms[i][4:] + " & " + terms[i+1]
-            location = "Front & Back"
-            if exclude_lasts[i+1]:
-                location += " (excl. last)"
-            print("| {:<15} | {:<8} | {:<25} |".format(
-                combined_term, 
-                f"{nums[i]},{nums[i+1]}", 
-                location
-            ))
-            i += 2
-        else:
-            location = {
-                "F": "Front",
-                "B": "Back",
-                "A": "Anywhere"
-            }.get(positions[i], positions[i])
-            if positions[i] == "B" and exclude_lasts[i]:
-                location += " (excl. last)"
-            print("| {:<15} | {:<8} | {:<25} |".format(
-                terms[i], 
-                nums[i], 
-                location
-            ))
-            i += 1
+    for pattern in plan:
+        location = {
+            "F": "Front",
+            "B": "Back",
+            "A": "Anywhere",
+            "FB": "Front & Back"
+        }[pattern.position]
+        if pattern.exclude_last:
+            location += " (excl. last)"
+        print("| {:<15} | {:<8} | {:<25} |".format(
+            " & ".join(pattern.terms),
+            ",".join(str(term_length(term)) for term in pattern.terms),
+            location
+        ))
     print("="*60)
     
-    if any(pos == "B" for pos in positions) or any(pos == "FB" for pos in positions):
+    if any(pattern.back is not None for pattern in plan):
         print("\nReminder: Valid end characters are:", ", ".join(sorted(VALID_END_CHARS)))
         print("="*60)
 
-def search_address(address, terms, nums, positions, exclude_lasts):
-    i = 0
-    while i < len(terms):
-        if i+1 < len(positions) and positions[i] == "F" and positions[i+1] == "B" and terms[i].startswith("F&B:"):
-            front_term = terms[i][4:]
-            back_term = terms[i+1]
-            if exclude_lasts[i+1]:
-                if (address[:len(front_term)] == front_term and 
-                    address[-len(back_term)-1:-1] == back_term):
-                    return True, f"{front_term} & {back_term} (excl. last)"
+def search_address(address, plan):
+    """Return (True, label) for the first pattern the address matches, or (False, None)."""
+    for pattern in plan:
+        if pattern.anywhere is not None:
+            target = pattern.anywhere
+            if isinstance(target, str):
+                if target in address:
+                    return True, pattern.label
+            elif any(slots_match(address[start:start + len(target)], target)
+                     for start in range(ALGORAND_ADDRESS_LENGTH - len(target) + 1)):
+                return True, pattern.label
+        elif all(target_matches(address[start:stop], target) for start, stop, _, target in pattern.parts):
+            return True, pattern.label
+    return False, None
+
+def term_value(term):
+    """Return the integer whose base32 digits spell out the term."""
+    value = 0
+    for c in term:
+        value = (value << 5) | BASE32_ALPHABET.index(c)
+    return value
+
+def term_mask(term):
+    """Return the bit mask that keeps the term's symbols and ignores its `?` wildcards."""
+    mask = 0
+    for slot in term_slots(term):
+        mask = (mask << 5) | (0 if len(slot) == len(BASE32_ALPHABET) else 0x1F)
+    return mask
+
+def term_values(term):
+    """Return the values of every string the term stands for, with wildcard bits cleared.
+
+    Wildcards are left to the mask, so only character classes multiply the values.
+    """
+    check_expansion(term, wildcards=False)
+    slots = [slot if len(slot) < len(BASE32_ALPHABET) else BASE32_ALPHABET[0] for slot in term_slots(term)]
+    return [term_value(chars) for chars in itertools.product(*slots)]
+
+def compile_front_filter(front_term):
+    """Compile a front term into a (byte count, shift, mask, values) prefix filter over the public key.
+
+    Only terms of up to KEY_CHARS characters fit in the key, longer ones are matched on the address bits.
+    """
+    # The first 51 characters are plain base32 of the 32 byte public key
+    nbits = term_length(front_term) * 5
+    nbytes = (nbits + 7) // 8
+    return nbytes, nbytes * 8 - nbits, term_mask(front_term), term_values(front_term)
+
+def compile_back_filter(back_term, exclude_last=False):
+    """Compile a back term into a (shift, mask, values) filter over the address tail bits."""
+    if term_length(back_term) + exclude_last > ALGORAND_ADDRESS_LENGTH:
+        raise ValueError(f"Back term '{back_term}' is longer than an address")
+
+    values = term_values(back_term)
+    # 36 bytes only fill 288 of the 290 bits behind 58 characters, so the last
+    # character always has its two low bits clear
+    if not exclude_last:
+        values = [value for value in values if not value & 0b11]
+        if not values:
+            valid_ends = ", ".join(sorted(VALID_END_CHARS))
+            raise ValueError(f"Back term '{back_term}' can never match, "
+                             f"addresses can only end with these characters: {valid_ends}")
+    return 5 if exclude_last else 0, term_mask(back_term), values
+
+def build_automaton(words):
+    """Build an Aho-Corasick automaton over (word, pattern id) pairs."""
+    goto = [{}]
+    outputs = [[]]
+    for word, pattern_id in words:
+        state = 0
+        for c in word:
+            if c not in goto[state]:
+                goto.append({})
+                outputs.append([])
+                goto[state][c] = len(goto) - 1
+            state = goto[state][c]
+        outputs[state].append(pattern_id)
+
+    # Breadth first, so every failure target already has its full output list
+    fail = [0] * len(goto)
+    pending = collections.deque(goto[0].values())
+    while pending:
+        state = pending.popleft()
+        for c, child in goto[state].items():
+            pending.append(child)
+            fallback = fail[state]
+            while fallback and c not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[child] = goto[fallback].get(c, 0)
+            outputs[child] = outputs[child] + outputs[fail[child]]
+    return goto, fail, outputs
+
+def scan_anywhere(address, anywhere):
+    """Return the ids of all Anywhere terms found in the address."""
+    kind, words = anywhere
+    if kind == "terms":
+        return [pattern_id for term, pattern_id in words if term in address]
+
+    goto, fail, outputs = words
+    hits = []
+    state = 0
+    for c in address:
+        while state and c not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(c, 0)
+        if outputs[state]:
+            hits.extend(outputs[state])
+    return hits
+
+def compile_matcher(plan):
+    """Compile a search plan into lookup tables that are checked once per address.
+
+    Front and back terms are grouped by bit window, so each distinct term length
+    costs one dict lookup however many terms share it. A `?` wildcard just clears
+    its bits from the window's mask and a character class adds one table entry per
+    string it stands for, so neither costs more per address than a plain term.
+    Anywhere terms go into an Aho-Corasick automaton once there are enough of them.
+    Raises ValueError for back terms that no address can ever end with.
+    """
+    front_tables = {}
+    long_front_tables = {}
+    back_tables = {}
+    anywhere_terms = []
+    # Where each pattern's values live, so retiring it never has to scan every table
+    entries = {}
+
+    def add_front(front_term, pattern_id):
+        if term_length(front_term) > KEY_CHARS:
+            # The term reaches into the checksum, so it is looked up in the address bits instead
+            table = long_front_tables.setdefault(
+                (ADDRESS_BITS - term_length(front_term) * 5, term_mask(front_term)), {})
+            values = term_values(front_term)
+        else:
+            nbytes, shift, mask, values = compile_front_filter(front_term)
+            table = front_tables.setdefault((nbytes, shift, mask), {})
+        for value in values:
+            table.setdefault(value, []).append(pattern_id)
+            entries.setdefault(pattern_id, []).append((table, value))
+
+    def add_back(back_term, exclude_last, pattern_id):
+        shift, mask, values = compile_back_filter(back_term, exclude_last)
+        table = back_tables.setdefault((shift, mask), {})
+        for value in values:
+            table.setdefault(value, []).append(pattern_id)
+            entries.setdefault(pattern_id, []).append((table, value))
+
+    for pattern in plan:
+        if pattern.front is not None:
+            add_front(pattern.front, pattern.pattern_id)
+        if pattern.back is not None:
+            add_back(pattern.back, pattern.exclude_last, pattern.pattern_id)
+        if pattern.anywhere is not None:
+            anywhere_terms.extend((word, pattern.pattern_id) for word in expand_term(pattern.terms[0]))
+
+    kinds = [pattern.position for pattern in plan]
+    return {
+        "kinds": kinds,
+        "front_tables": [(nbytes, shift, mask, table) for (nbytes, shift, mask), table in front_tables.items()],
+        "long_front_tables": [(shift, mask, table) for (shift, mask), table in long_front_tables.items()],
+        "back_tables": [(shift, mask, table) for (shift, mask), table in back_tables.items()],
+        "has_back": "B" in kinds,
+        "live_backs": kinds.count("B"),
+        "anywhere_terms": anywhere_terms,
+        "anywhere": compile_anywhere(anywhere_terms),
+        "entries": entries,
+    }
+
+def compile_anywhere(anywhere_terms):
+    """Pick substring checks or an Aho-Corasick automaton for the (word, pattern id) pairs."""
+    if not anywhere_terms:
+        return None
+    if len(anywhere_terms) < ANYWHERE_SCAN_LIMIT:
+        return ("terms", anywhere_terms)
+    return ("automaton", build_automaton(anywhere_terms))
+
+def address_checksum(public_key):
+    """Return the 4 byte SHA-512/256 checksum that forms the tail of an address."""
+    if HAVE_SHA512_256:
+        return hashlib.new("sha512_256", public_key).digest()[-4:]
+    return encoding.checksum(public_key)[-4:]
+
+def address_bits(public_key, checksum=None):
+    """Return the 290 bits behind the 58 address characters as one integer.
+
+    The checksum is computed unless it is already known, as it is in a corpus.
+    """
+    if checksum is None:
+        checksum = address_checksum(public_key)
+    return int.from_bytes(public_key + checksum, "big") << 2
+
+def address_from_bits(bits):
+    """Base32 encode address bits, two characters at a time."""
+    return "".join([BASE32_PAIRS[(bits >> shift) & 0x3FF] for shift in PAIR_SHIFTS])
+
+def match_public_key(public_key, matcher, checksum=None):
+    """Return (pattern ids, address) for every compiled pattern the public key satisfies.
+
+    The address is None when nothing matched and no Anywhere term needed it.
+    """
+    kinds = matcher["kinds"]
+    matched = []
+    pending_backs = set()
+    for nbytes, shift, mask, table in matcher["front_tables"]:
+        pattern_ids = table.get((int.from_bytes(public_key[:nbytes], "big") >> shift) & mask)
+        if pattern_ids:
+            for pattern_id in pattern_ids:
+                if kinds[pattern_id] == "FB":
+                    pending_backs.add(pattern_id)
+                else:
+                    matched.append(pattern_id)
+
+    bits = None
+    if matcher["long_front_tables"]:
+        bits = address_bits(public_key, checksum)
+        for shift, mask, table in matcher["long_front_tables"]:
+            pattern_ids = table.get((bits >> shift) & mask)
+            if pattern_ids:
+                for pattern_id in pattern_ids:
+                    if kinds[pattern_id] == "FB":
+                        pending_backs.add(pattern_id)
+                    else:
+                        matched.append(pattern_id)
+
+    # The checksum is only computed when a back term could still match
+    if pending_backs or matcher["has_back"]:
+        if bits is None:
+            bits = address_bits(public_key, checksum)
+        for shift, mask, table in matcher["back_tables"]:
+            pattern_ids = table.get((bits >> shift) & mask)
+            if pattern_ids:
+                for pattern_id in pattern_ids:
+                    if kinds[pattern_id] == "B" or pattern_id in pending_backs:
+                        matched.append(pattern_id)
+
+    address = None
+    if matcher["anywhere"] is not None:
+        address = address_from_bits(bits if bits is not None else address_bits(public_key, checksum))
+        matched.extend(scan_anywhere(address, matcher["anywhere"]))
+
+    if not matched:
+        return matched, address
+    if address is None:
+        address = address_from_bits(bits if bits is not None else address_bits(public_key, checksum))
+    return sorted(set(matched)), address
+
+def compile_vector_matcher(plan):
+    """Compile a search plan into symbol code targets for matching whole batches with NumPy.
+
+    Anchored patterns become (start, codes) parts that must all match, and Anywhere
+    terms are tried at every start position.
+    """
+    # Reuse the scalar compiler to reject patterns that could never match
+    compile_matcher(plan)
+    anchored = []
+    anywhere = []
+
+    def codes_of(term):
+        # One code per plain slot, None for a wildcard and an array of codes for a class
+        codes = []
+        for slot in term_slots(term):
+            if len(slot) == len(BASE32_ALPHABET):
+                codes.append(None)
+            elif len(slot) == 1:
+                codes.append(BASE32_ALPHABET.index(slot))
             else:
-                if (address[:len(front_term)] == front_term and 
-                    address[-len(back_term):] == back_term):
-                    return True, f"{front_term} & {back_term}"
-            i += 2
+                codes.append(np.array([BASE32_ALPHABET.index(c) for c in slot], dtype=np.uint8))
+        return codes
+
+    for pattern in plan:
+        if pattern.anywhere is not None:
+            anywhere.append((pattern.pattern_id, codes_of(pattern.terms[0])))
         else:
-            term_len = len(terms[i])
-            if positions[i] == "A" and terms[i] in address:
-                return True, terms[i]
-            elif positions[i] == "F" and address[:term_len] == terms[i]:
-                return True, terms[i]
-            elif positions[i] == "B":
-                if exclude_lasts[i]:
-                    if address[-term_len-1:-1] == terms[i]:
-                        return True, f"{terms[i]} (excl. last)"
+            anchored.append((pattern.pattern_id, [(start, codes_of(term)) for start, _, term, _ in pattern.parts]))
+
+    return {
+        "vectorized": True,
+        "anchored": anchored,
+        "anywhere": anywhere,
+        "needs_checksum": needs_checksum(anchored, anywhere),
+    }
+
+def needs_checksum(anchored, anywhere):
+    """Check if any vector pattern looks past the first KEY_CHARS symbols, which need the checksum."""
+    # Searches for short front terms never compute it
+    return bool(anywhere) or any(start + len(codes) > KEY_CHARS for _, parts in anchored for start, codes in parts)
+
+def retire_patterns(matcher, retired):
+    """Drop newly retired pattern ids from a compiled matcher, in place.
+
+    Only the table entries of the retired patterns are touched, so retiring costs
+    the same however many patterns are left. Pattern ids stay the same, so matches
+    still report the right terms.
+    """
+    retired = set(retired)
+    if matcher.get("vectorized"):
+        matcher["anchored"] = [(pattern_id, parts) for pattern_id, parts in matcher["anchored"]
+                               if pattern_id not in retired]
+        matcher["anywhere"] = [(pattern_id, target) for pattern_id, target in matcher["anywhere"]
+                               if pattern_id not in retired]
+        matcher["needs_checksum"] = needs_checksum(matcher["anchored"], matcher["anywhere"])
+        return matcher
+
+    kinds = matcher["kinds"]
+    for pattern_id in retired:
+        for table, value in matcher["entries"].pop(pattern_id, ()):
+            pattern_ids = [other for other in table.get(value, ()) if other != pattern_id]
+            if pattern_ids:
+                table[value] = pattern_ids
+            else:
+                table.pop(value, None)
+        if kinds[pattern_id] == "B":
+            matcher["live_backs"] -= 1
+    matcher["front_tables"] = [entry for entry in matcher["front_tables"] if entry[3]]
+    matcher["long_front_tables"] = [entry for entry in matcher["long_front_tables"] if entry[2]]
+    matcher["back_tables"] = [entry for entry in matcher["back_tables"] if entry[2]]
+    matcher["has_back"] = matcher["live_backs"] > 0
+
+    # The automaton is only rebuilt when an Anywhere pattern is retired
+    if any(kinds[pattern_id] == "A" for pattern_id in retired):
+        matcher["anywhere_terms"] = [(word, pattern_id) for word, pattern_id in matcher["anywhere_terms"]
+                                     if pattern_id not in retired]
+        matcher["anywhere"] = compile_anywhere(matcher["anywhere_terms"])
+    return matcher
+
+def address_codes(raw):
+    """Unpack an (N, 36) uint8 array of public key plus checksum bytes into (N, 58) base32 symbol codes."""
+    # Every 5 bytes hold exactly 8 symbols, so pad to 40 bytes and split all groups at once
+    padded = np.zeros((len(raw), 40), dtype=np.uint8)
+    padded[:, :36] = raw
+    groups = padded.reshape(-1, 8, 5)
+    b0, b1, b2, b3, b4 = (groups[:, :, i] for i in range(5))
+
+    codes = np.empty((len(raw), 8, 8), dtype=np.uint8)
+    codes[:, :, 0] = b0 >> 3
+    codes[:, :, 1] = ((b0 & 0x07) << 2) | (b1 >> 6)
+    codes[:, :, 2] = (b1 >> 1) & 0x1F
+    codes[:, :, 3] = ((b1 & 0x01) << 4) | (b2 >> 4)
+    codes[:, :, 4] = ((b2 & 0x0F) << 1) | (b3 >> 7)
+    codes[:, :, 5] = (b3 >> 2) & 0x1F
+    codes[:, :, 6] = ((b3 & 0x03) << 3) | (b4 >> 5)
+    codes[:, :, 7] = b4 & 0x1F
+    return codes.reshape(len(raw), 64)[:, :ALGORAND_ADDRESS_LENGTH]
+
+def symbols_match(column, symbol):
+    """Compare a column of symbol codes with one slot of a compiled term."""
+    if isinstance(symbol, int):
+        return column == symbol
+    return np.isin(column, symbol)
+
+def narrow_rows(codes, rows, start, target):
+    """Keep the rows whose symbols from `start` on spell out the target codes."""
+    for offset, symbol in enumerate(target):
+        if symbol is None:
+            continue
+        rows = rows[symbols_match(codes[rows, start + offset], symbol)]
+        if not len(rows):
+            break
+    return rows
+
+def match_codes(codes, vector_matcher):
+    """Return {row: [pattern ids]} for the rows of a symbol code batch that match any pattern."""
+    all_rows = np.arange(len(codes))
+    hits = {}
+    for pattern_id, parts in vector_matcher["anchored"]:
+        rows = all_rows
+        for start, target in parts:
+            rows = narrow_rows(codes, rows, start, target)
+        for row in rows.tolist():
+            hits.setdefault(row, []).append(pattern_id)
+
+    for pattern_id, target in vector_matcher["anywhere"]:
+        # Compare every start position at once, one symbol of the term at a time
+        span = ALGORAND_ADDRESS_LENGTH - len(target) + 1
+        found = np.ones((len(codes), span), dtype=bool)
+        for offset, symbol in enumerate(target):
+            if symbol is not None:
+                found &= symbols_match(codes[:, offset:offset + span], symbol)
+        for row in np.flatnonzero(found.any(axis=1)).tolist():
+            hits.setdefault(row, []).append(pattern_id)
+    return hits
+
+def search_vector_batch(seeds, public_keys, vector_matcher):
+    """Match a batch of raw keypairs with NumPy, returning (pattern ids, address, private_key) per hit."""
+    if vector_matcher["needs_checksum"]:
+        raw = b"".join([public_key + address_checksum(public_key) for public_key in public_keys])
+    else:
+        raw = b"".join([public_key + bytes(4) for public_key in public_keys])
+    codes = address_codes(np.frombuffer(raw, dtype=np.uint8).reshape(-1, 36))
+
+    matches = []
+    for row, pattern_ids in sorted(match_codes(codes, vector_matcher).items()):
+        public_key = public_keys[row]
+        matches.append((sorted(pattern_ids),
+                        address_from_bits(address_bits(public_key)),
+                        private_key_from_raw(seeds[row], public_key)))
+    return matches
+
+def search_batch(seeds, public_keys, matcher):
+    """Search a batch of raw keypairs, returning (pattern ids, address, private_key) per hit."""
+    if matcher.get("vectorized"):
+        return search_vector_batch(seeds, public_keys, matcher)
+
+    matches = []
+    for seed, public_key in zip(seeds, public_keys):
+        match = check_candidate(seed, public_key, matcher)
+        if match:
+            matches.append(match)
+    return matches
+
+def generate_seeds(count):
+    """Cut `count` random ed25519 seeds from a single block of OS entropy."""
+    block = os.urandom(SEED_LENGTH * count)
+    return [block[i:i + SEED_LENGTH] for i in range(0, len(block), SEED_LENGTH)]
+
+def derive_seeds(master_secret, counter, count):
+    """Derive the seeds for counters counter..counter+count-1 from a master secret."""
+    return [hashlib.blake2b(n.to_bytes(16, "big"), digest_size=SEED_LENGTH, key=master_secret,
+                            person=b"AlgoVanitySeed").digest()
+            for n in range(counter, counter + count)]
+
+def next_seeds(master_secret, counter, count):
+    """Return the next batch of seeds, random or derived from the master secret."""
+    if master_secret is None:
+        return generate_seeds(count)
+    return derive_seeds(master_secret, counter, count)
+
+def load_master_secret(filename):
+    """Load the hex master secret for deterministic seeds, creating a new one if the file is missing."""
+    if not os.path.exists(filename):
+        # Only the owner may read it, anyone holding it can rebuild every key it produced
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(os.urandom(SEED_LENGTH).hex() + "\n")
+        print(f"Created a new master secret in '{filename}'. Keep it safe and private.")
+
+    with open(filename, 'r') as f:
+        master_secret = bytes.fromhex(f.read().strip())
+    if len(master_secret) != SEED_LENGTH:
+        raise ValueError(f"Master secret in '{filename}' must be {SEED_LENGTH * 2} hex characters")
+    return master_secret
+
+def nacl_public_keys(seeds):
+    """Derive ed25519 public keys from seeds with libsodium, as algosdk does."""
+    return [crypto_sign_seed_keypair(seed)[0] for seed in seeds]
+
+def cryptography_public_keys(seeds):
+    """Derive ed25519 public keys from seeds with the cryptography package."""
+    return [Ed25519PrivateKey.from_private_bytes(seed).public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+            for seed in seeds]
+
+KEYGEN_BACKENDS = {"nacl": nacl_public_keys}
+if Ed25519PrivateKey is not None:
+    KEYGEN_BACKENDS["cryptography"] = cryptography_public_keys
+
+def verify_keygen_backend(backend):
+    """Check the backend rebuilds the same private key, address and mnemonic as algosdk."""
+    seed = generate_seeds(1)[0]
+    public_key = KEYGEN_BACKENDS[backend]([seed])[0]
+    private_key = private_key_from_raw(seed, public_key)
+
+    # generate_account() is SigningKey.generate() plus this encoding, so rebuild it from the same seed
+    signing_key = SigningKey(seed)
+    expected = base64.b64encode(signing_key.encode() + signing_key.verify_key.encode()).decode()
+    return (private_key == expected
+            and account.address_from_private_key(private_key) == encoding.encode_address(public_key)
+            and mnemonic.to_private_key(mnemonic.from_private_key(private_key)) == private_key)
+
+def private_key_from_raw(seed, public_key):
+    """Build the algosdk base64 private key from raw seed and public key bytes."""
+    return base64.b64encode(seed + public_key).decode()
+
+def check_candidate(seed, public_key, matcher):
+    """Search one raw keypair, returning (pattern ids, address, private_key) or None."""
+    pattern_ids, address = match_public_key(public_key, matcher)
+    if not pattern_ids:
+        return None
+    return pattern_ids, address, private_key_from_raw(seed, public_key)
+
+def symbol_choices(position):
+    """Return the characters that can appear at an address position."""
+    # The last character only carries 3 bits, so just 8 characters can appear there
+    return VALID_END_CHARS if position == ALGORAND_ADDRESS_LENGTH - 1 else VALID_CHARS
+
+def anchored_probability(term, start):
+    """Chance that a random address has the term at a fixed start position."""
+    probability = 1.0
+    for offset, slot in enumerate(term_slots(term)):
+        choices = symbol_choices(start + offset)
+        probability *= sum(1 for c in slot if c in choices) / len(choices)
+    return probability
+
+def anywhere_probability(term):
+    """Exact chance that the term appears at least once in a random address.
+
+    Tracks every partial match the address could be in the middle of, which is the
+    term's KMP automaton for plain terms and also works for wildcards and classes.
+    Overlapping occurrences and the restricted last character are both accounted for.
+    """
+    slots = term_slots(term)
+    k = len(slots)
+    transitions = {}
+
+    def step(state, c):
+        # A state is the set of slot counts matched so far that end at this character
+        key = (state, c)
+        if key not in transitions:
+            transitions[key] = frozenset([0] + [matched + 1 for matched in state if c in slots[matched]])
+        return transitions[key]
+
+    states = {frozenset([0]): 1.0}
+    found = 0.0
+    for position in range(ALGORAND_ADDRESS_LENGTH):
+        choices = symbol_choices(position)
+        weight = 1 / len(choices)
+        next_states = {}
+        for state, probability in states.items():
+            for c in choices:
+                next_state = step(state, c)
+                if k in next_state:
+                    found += probability * weight
                 else:
-                    if address[-term_len:] == terms[i]:
-                        return True, terms[i]
-            i += 1
-    return False, None
+                    next_states[next_state] = next_states.get(next_state, 0.0) + probability * weight
+        states = next_states
+    return found
+
+def pattern_probabilities(plan):
+    """Return the per-address match probability of each pattern, in pattern id order."""
+    return [anywhere_probability(pattern.terms[0]) if pattern.anywhere is not None
+            else math.prod(anchored_probability(term, start) for start, _, term, _ in pattern.parts)
+            for pattern in plan]
+
+def combined_probability(probabilities):
+    """Chance that an address matches at least one pattern, treating patterns as independent."""
+    miss = 1.0
+    for probability in probabilities:
+        miss *= 1 - probability
+    return 1 - miss
+
+def time_to_chance(chance, probability, rate):
+    """Seconds of searching at `rate` addresses/sec for a `chance` of at least one hit."""
+    if probability <= 0 or rate <= 0:
+        return math.inf
+    return math.log(1 / (1 - chance)) / (-math.log1p(-probability) * rate)
+
+def format_duration(seconds):
+    """Format a duration the way people read ETAs: 45s, 12m 5s, 3h 20m, 14d 2h."""
+    if seconds == math.inf or seconds > 100 * 365 * 86400:
+        return "100+ years"
+    if seconds < 1:
+        return "<1s"
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    if seconds < 86400:
+        return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+    if seconds < 365 * 86400:
+        return f"{seconds // 86400}d {seconds % 86400 // 3600}h"
+    return f"{seconds / (365 * 86400):.1f} years"
+
+def measure_search_rate(backend, matcher, seconds=RATE_SAMPLE_SECONDS, corpus=None, batch_size=None):
+    """Measure addresses/sec for one process with this backend, compiled matcher and batch size."""
+    ranges = [(0, corpus["records"] if corpus else 1 << 62)]
+    checked = 0
+    start = time.perf_counter()
+    for size, _, _ in search_ranges(ranges, None, backend, matcher, corpus=corpus, batch_size=batch_size):
+        checked += size
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return checked / elapsed
+    # A small corpus can be scanned in less time than the sample
+    return checked / max(time.perf_counter() - start, 1e-9)
+
+def display_difficulty(labels, probabilities, total_addresses, rate):
+    """Show how likely each pattern is and how long a hit should take at the measured rate."""
+    print("\n" + "="*78)
+    print("Difficulty Estimate".center(78))
+    print("="*78)
+    print(f"Measured Speed: {rate:,.0f} addresses/sec")
+    print("-"*78)
+    print("| {:<22} | {:>14} | {:>10} | {:>9} | {:>9} |".format(
+        "Pattern", "1 in", "Exp. Hits", "50% Hit", "90% Hit"))
+    print("-"*78)
+
+    rows = list(zip(labels, probabilities))
+    for label, probability in rows[:PATTERN_DISPLAY_LIMIT]:
+        one_in = f"{1 / probability:,.0f}" if probability else "never"
+        print("| {:<22} | {:>14} | {:>10,.2f} | {:>9} | {:>9} |".format(
+            label[:22], one_in, total_addresses * probability,
+            format_duration(time_to_chance(0.5, probability, rate)),
+            format_duration(time_to_chance(0.9, probability, rate))))
+    if len(rows) > PATTERN_DISPLAY_LIMIT:
+        print(f"... and {len(rows) - PATTERN_DISPLAY_LIMIT:,} more patterns")
+
+    probability = combined_probability(probabilities)
+    print("-"*78)
+    print("| {:<22} | {:>14} | {:>10,.2f} | {:>9} | {:>9} |".format(
+        "Any pattern", f"{1 / probability:,.0f}" if probability else "never", total_addresses * probability,
+        format_duration(time_to_chance(0.5, probability, rate)),
+        format_duration(time_to_chance(0.9, probability, rate))))
+    print("="*78)
+    chance = 1 - (1 - probability) ** total_addresses
+    print(f"Chance of at least one match in {total_addresses:,} addresses: {chance:.1%}")
+    if chance < 0.5:
+        needed = math.ceil(math.log(0.5) / math.log1p(-probability)) if probability else 0
+        if needed:
+            print(f"Warning: Check at least {needed:,} addresses for an even chance of a match.")
+        else:
+            print("Warning: None of these patterns can ever match.")
+    print("="*78)
 
 def get_number_input(prompt):
     """Helper function to get valid number input."""
@@ -269,21 +1158,28 @@ def get_number_input(prompt):
             print("Please enter a valid number.")
 
 def get_search_terms(total_addresses):
-    terms = []
-    nums = []
-    positions = []
-    exclude_lasts = []
+    plan = SearchPlan()
     
     print("\nWould you like to:")
     print("1. Load default search terms (searchAlgo.json)")
     print("2. Load search terms from a custom file")
     print("3. Enter search terms manually")
+    print("4. Load a wordlist (one word per line, searched at the front and back)")
     
     while True:
-        choice = input("\nEnter your choice (1, 2 or 3): ")
-        if choice in ["1", "2", "3"]:
+        choice = input("\nEnter your choice (1, 2, 3 or 4): ")
+        if choice in ["1", "2", "3", "4"]:
             break
-        print("Please enter 1, 2, or 3.")
+        print("Please enter 1, 2, 3 or 4.")
+
+    if choice == "4":
+        filename = input("\nEnter the path to your wordlist (or press Enter to skip): ").strip()
+        if filename:
+            min_length = get_number_input("Enter the minimum word length to search for: \n")
+            loaded = load_wordlist(filename, min_length, total_addresses)
+            if loaded:
+                return loaded
+        print("\nFalling back to manual entry...")
     
     if choice in ["1", "2"]:
         if choice == "1":
@@ -296,78 +1192,11 @@ def get_search_terms(total_addresses):
                 choice = "3"
         
         if choice != "3":
-            try:
-                if not os.path.exists(filename):
-                    print(f"Error: File '{filename}' not found.")
-                    print("\nFalling back to manual entry...")
-                else:
-                    with open(filename, 'r') as f:
-                        data = json.load(f)
-                        
-                    if "search_terms" not in data:
-                        print("Error: File must contain a 'search_terms' array.")
-                        print("\nFalling back to manual entry...")
-                    else:
-                        terms = []
-                        nums = []
-                        positions = []
-                        exclude_lasts = []
-                        
-                        for term_data in data["search_terms"]:
-                            if term_data["position"] == "FB":
-                                # Add the F&B: prefix to mark it as a combined search
-                                terms.extend([f"F&B:{term_data['front_term']}", term_data['back_term']])
-                                nums.extend([term_data['front_digits'], term_data['back_digits']])
-                                positions.extend(["F", "B"])
-                                # Use the exclude_last value from the JSON
-                                exclude_lasts.extend([False, term_data.get('exclude_last', False)])
-                            else:
-                                terms.append(term_data["term"])
-                                nums.append(term_data["digits"])
-                                positions.append(term_data["position"])
-                                exclude_lasts.append(term_data.get("exclude_last", False))
-                        
-                        # Validate the loaded terms
-                        valid_terms = True
-                        for i, (term, num, pos) in enumerate(zip(terms, nums, positions)):
-                            term_to_check = term[4:] if term.startswith("F&B:") else term
-                            if not validate_search_term(term_to_check):
-                                print(f"Error: Invalid characters in term '{term_to_check}'")
-                                valid_terms = False
-                                break
-                                
-                            if len(term_to_check) != num:
-                                print(f"Error: Term '{term_to_check}' length doesn't match specified digits {num}")
-                                valid_terms = False
-                                break
-                                
-                            # Only validate end chars for standalone back positions
-                            if pos == "B" and not exclude_lasts[i] and not any(t.startswith("F&B:") for t in terms[max(0, i-1):i+1]):
-                                valid, message = validate_end_chars(term)
-                                if not valid:
-                                    print(f"Error in term '{term}': {message}")
-                                    valid_terms = False
-                                    break
-                        
-                        if valid_terms:
-                            display_search_terms(terms, nums, positions, exclude_lasts, total_addresses)
-                            return terms, nums, positions, exclude_lasts
-                        
-                        print("\nFalling back to manual entry...")
-                        terms = []
-                        nums = []
-                        positions = []
-                        exclude_lasts = []
-                        
-            except json.JSONDecodeError:
-                print("Error: Invalid JSON format in file.")
-                print("\nFalling back to manual entry...")
-            except KeyError as e:
-                print(f"Error: Missing required field {e} in search terms file.")
-                print("\nFalling back to manual entry...")
-            except Exception as e:
-                print(f"Error loading file: {str(e)}")
-                print("\nFalling back to manual entry...")
+            loaded = read_search_terms(filename)
+            if loaded:
+                display_search_terms(loaded, total_addresses)
+                return loaded
+            print("\nFalling back to manual entry...")
     
     while True:
         print("\nSearch Locations:")
@@ -398,23 +1227,23 @@ def get_search_terms(total_addresses):
             num = get_number_input("Enter number of characters to search at the front: \n")
         
         while True:
-            searchterm = str(input(f"Enter {num} character(s): \n")).upper()
+            searchterm = str(input(f"Enter {num} character(s) (? = any character, [AB] = A or B): \n")).upper()
             if not validate_search_term(searchterm):
-                print(f"Error: Invalid characters detected. Only use: {sorted(VALID_CHARS)}")
+                print(f"Error: Invalid characters detected. Only use: {sorted(VALID_CHARS)}, ? and [..]")
                 continue
             
-            if len(searchterm) != num:
+            if term_length(searchterm) != num:
                 print(f"Error: Please enter exactly {num} characters.")
                 continue
             
             if pos == "FB":
                 bnum = get_number_input("Enter number of characters to search at the back: \n")
                 while True:
-                    bterm = str(input(f"Enter {bnum} character(s): \n")).upper()
+                    bterm = str(input(f"Enter {bnum} character(s) (? = any character, [AB] = A or B): \n")).upper()
                     if not validate_search_term(bterm):
-                        print(f"Error: Invalid characters detected. Only use: {sorted(VALID_CHARS)}")
+                        print(f"Error: Invalid characters detected. Only use: {sorted(VALID_CHARS)}, ? and [..]")
                         continue
-                    if len(bterm) != bnum:
+                    if term_length(bterm) != bnum:
                         print(f"Error: Please enter exactly {bnum} characters.")
                         continue
                     if not exclude_last:  # Only validate end chars if not excluding last
@@ -424,32 +1253,24 @@ def get_search_terms(total_addresses):
                             continue
                     break
                 
-                terms.extend([f"F&B:{searchterm}", bterm])
-                nums.extend([num, bnum])
-                positions.extend(["F", "B"])
-                exclude_lasts.extend([False, exclude_last])
+                terms = [searchterm, bterm]
             else:
                 if pos == "B" and not exclude_last:
                     valid, message = validate_end_chars(searchterm)
                     if not valid:
                         print(message)
                         continue
-                terms.append(searchterm)
-                nums.append(num)
-                positions.append(pos)
-                exclude_lasts.append(exclude_last)
+                terms = [searchterm]
+
+            try:
+                plan.add(pos, terms, exclude_last)
+            except ValueError as e:
+                print(f"Error: {e}")
+                continue
             break
         
-        display_search_terms(terms, nums, positions, exclude_lasts, total_addresses)
-        
-        # Show end character reminder if needed
-        has_back_patterns = any(
-            (pos == "B" or (pos == "FB" and i % 2 == 1)) and not excl 
-            for i, (pos, excl) in enumerate(zip(positions, exclude_lasts))
-        )
-        if has_back_patterns:
-            print("\nReminder: Valid end characters are:", ", ".join(sorted(VALID_END_CHARS)))
-            print("="*60)
+        # Also shows the end character reminder when there are back patterns
+        display_search_terms(plan, total_addresses)
         
         while True:
             add_more = str.upper(input("Do you want to add another search term? (Y)es or (N)o: \n"))
@@ -460,58 +1281,1652 @@ def get_search_terms(total_addresses):
         if add_more != "Y":
             break
             
-    return terms, nums, positions, exclude_lasts
+    return plan
     
     
     
-def main():
-    display_logo()
-    
+def corpus_key(passphrase, salt):
+    """Derive the key that encrypts a corpus' seed column from a passphrase."""
+    return hashlib.scrypt(passphrase.encode("utf-8"), salt=salt, n=1 << 15, r=8, p=1,
+                          maxmem=1 << 26, dklen=SEED_LENGTH)
+
+def corpus_key_check(key):
+    """Return the value stored in the corpus header to recognise the right passphrase."""
+    return hashlib.blake2b(b"", digest_size=16, key=key, person=b"AlgoVanityCheck").digest()
+
+def crypt_corpus_seed(key, index, seed):
+    """Encrypt or decrypt the seed of record `index` with a keystream unique to that record."""
+    if key is None:
+        return seed
+    keystream = hashlib.blake2b(index.to_bytes(16, "big"), digest_size=SEED_LENGTH, key=key,
+                                person=b"AlgoVanityCorpus").digest()
+    return bytes(a ^ b for a, b in zip(seed, keystream))
+
+def read_corpus_header(filename):
+    """Read a corpus header, returning (record count, salt, key check) or raising ValueError."""
+    with open(filename, 'rb') as f:
+        header = f.read(CORPUS_HEADER_LENGTH)
+    if len(header) != CORPUS_HEADER_LENGTH or header[:8] != CORPUS_MAGIC:
+        raise ValueError(f"'{filename}' is not an address corpus")
+    if header[8] != CORPUS_VERSION:
+        raise ValueError(f"'{filename}' is a version {header[8]} corpus, only version {CORPUS_VERSION} is supported")
+    records = int.from_bytes(header[16:24], "big")
+    if header[9] & CORPUS_ENCRYPTED:
+        return records, header[24:40], header[40:56]
+    return records, None, None
+
+def write_corpus_header(f, records, salt=None, check=None):
+    """Write a corpus header at the start of an open corpus file."""
+    header = bytearray(CORPUS_HEADER_LENGTH)
+    header[:8] = CORPUS_MAGIC
+    header[8] = CORPUS_VERSION
+    header[16:24] = records.to_bytes(8, "big")
+    if salt is not None:
+        header[9] = CORPUS_ENCRYPTED
+        header[24:40] = salt
+        header[40:56] = check
+    os.pwrite(f.fileno(), bytes(header), 0)
+
+def open_corpus(filename, passphrase=None):
+    """Open an existing corpus for searching, returning a picklable corpus description."""
+    records, salt, check = read_corpus_header(filename)
+    key = None
+    if salt is not None:
+        if passphrase is None:
+            raise ValueError(f"Corpus '{filename}' is encrypted, its passphrase is needed to recover matches")
+        key = corpus_key(passphrase, salt)
+        if corpus_key_check(key) != check:
+            raise ValueError(f"Wrong passphrase for corpus '{filename}'")
+    return {"filename": filename, "records": records, "key": key}
+
+def corpus_records(seeds, public_keys, first_record, key):
+    """Pack keypairs into corpus records, encrypting the seeds when a key is given."""
+    return b"".join([crypt_corpus_seed(key, first_record + i, seed) + public_key + address_checksum(public_key)
+                     for i, (seed, public_key) in enumerate(zip(seeds, public_keys))])
+
+def corpus_worker(worker_id, filename, first_record, ranges, master_secret, backend, key, checked):
+    """Worker process: generate keypairs for its counter ranges and write them into its slice of the corpus."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    keygen = KEYGEN_BACKENDS[backend]
+    record = first_record
+    with open(filename, 'r+b') as f:
+        for counter, count in ranges:
+            written = 0
+            while written < count:
+                size = min(KEYGEN_BATCH, count - written)
+                seeds = next_seeds(master_secret, counter + written, size)
+                os.pwrite(f.fileno(), corpus_records(seeds, keygen(seeds), record, key),
+                          CORPUS_HEADER_LENGTH + record * CORPUS_RECORD_LENGTH)
+                record += size
+                written += size
+                # Counted only once written, so the parent knows whether the whole build made it to disk
+                checked[worker_id] += size
+
+def build_corpus(filename, total_addresses, workers=1, backend="nacl", passphrase=None, master_secret=None,
+                 counter_start=0, progress=True, log_interval=None):
+    """Generate keypairs once and append them to a corpus file for searching many times later.
+
+    Each worker writes its own slice of the file, and the header only counts the new
+    records once they are all written, so an interrupted build leaves the corpus as it was.
+    Progress is shown like run_search's, from a shared counter per worker.
+    Returns the number of records added.
+    """
+    if os.path.exists(filename):
+        records, salt, check = read_corpus_header(filename)
+        if (salt is None) != (passphrase is None):
+            raise ValueError(f"Corpus '{filename}' is {'not ' if salt is None else ''}encrypted, "
+                             f"{'drop' if salt is None else 'give'} the passphrase to append to it")
+    else:
+        # The seeds are private keys, so only the owner may read the file
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        os.close(fd)
+        records = 0
+        salt = os.urandom(16) if passphrase is not None else None
+        check = None
+
+    key = None
+    if passphrase is not None:
+        key = corpus_key(passphrase, salt)
+        if check is None:
+            check = corpus_key_check(key)
+        elif corpus_key_check(key) != check:
+            raise ValueError(f"Wrong passphrase for corpus '{filename}'")
+
+    worker_ranges = split_ranges([(counter_start, total_addresses)], workers)
+    first_records = []
+    next_record = records
+    for assigned in worker_ranges:
+        first_records.append(next_record)
+        next_record += sum(count for _, count in assigned)
+
+    with open(filename, 'r+b') as f:
+        write_corpus_header(f, records, salt, check)
+        f.truncate(CORPUS_HEADER_LENGTH + next_record * CORPUS_RECORD_LENGTH)
+        checked = mp.RawArray('q', len(worker_ranges))
+        processes = [mp.Process(target=corpus_worker,
+                                args=(worker_id, filename, first_records[worker_id], assigned, master_secret,
+                                      backend, key, checked),
+                                daemon=True)
+                     for worker_id, assigned in enumerate(worker_ranges) if assigned]
+        try:
+            with tqdm(total=total_addresses, desc="Building corpus", unit="addr",
+                      disable=not progress or bool(log_interval)) as pbar:
+                display_stop = threading.Event()
+                display = None
+                if progress:
+                    display = threading.Thread(target=progress_loop,
+                                               args=(lambda: (sum(checked), None, {}, None), total_addresses, 0,
+                                                     display_stop, pbar, log_interval, "Building corpus"),
+                                               daemon=True)
+                    display.start()
+                try:
+                    for process in processes:
+                        process.start()
+                    for process in processes:
+                        process.join()
+                finally:
+                    display_stop.set()
+                    if display is not None:
+                        display.join()
+        except KeyboardInterrupt:
+            print("\nCorpus build stopped early.")
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+
+            added = sum(checked)
+            if added == total_addresses:
+                os.fsync(f.fileno())
+                write_corpus_header(f, next_record, salt, check)
+                os.fsync(f.fileno())
+            else:
+                # Workers fill their slices in parallel, so a partial build has holes: drop it
+                f.truncate(CORPUS_HEADER_LENGTH + records * CORPUS_RECORD_LENGTH)
+                added = 0
+    return added
+
+def corpus_match(view, index, pattern_ids, public_key, checksum, key):
+    """Turn a matching corpus record into (pattern ids, address, private_key)."""
+    offset = CORPUS_HEADER_LENGTH + index * CORPUS_RECORD_LENGTH
+    seed = crypt_corpus_seed(key, index, bytes(view[offset:offset + SEED_LENGTH]))
+    if crypto_sign_seed_keypair(seed)[0] != public_key:
+        raise ValueError(f"Corpus record {index:,} is corrupt, its seed does not give its public key")
+    return (sorted(pattern_ids), address_from_bits(address_bits(public_key, checksum)),
+            private_key_from_raw(seed, public_key))
+
+def search_corpus_batch(view, first_record, count, matcher, key):
+    """Match `count` corpus records from `first_record` on, using their stored checksums."""
+    start = CORPUS_HEADER_LENGTH + first_record * CORPUS_RECORD_LENGTH
+    matches = []
+    if matcher.get("vectorized"):
+        rows = np.frombuffer(view, dtype=np.uint8, count=count * CORPUS_RECORD_LENGTH,
+                             offset=start).reshape(count, CORPUS_RECORD_LENGTH)
+        hits = match_codes(address_codes(rows[:, SEED_LENGTH:]), matcher)
+        for row, pattern_ids in sorted(hits.items()):
+            public_key = rows[row, SEED_LENGTH:SEED_LENGTH + 32].tobytes()
+            checksum = rows[row, SEED_LENGTH + 32:].tobytes()
+            matches.append(corpus_match(view, first_record + row, pattern_ids, public_key, checksum, key))
+        return matches
+
+    for i in range(count):
+        offset = start + i * CORPUS_RECORD_LENGTH + SEED_LENGTH
+        public_key = view[offset:offset + 32]
+        checksum = view[offset + 32:offset + 36]
+        pattern_ids, _ = match_public_key(public_key, matcher, checksum)
+        if pattern_ids:
+            matches.append(corpus_match(view, first_record + i, pattern_ids, public_key, checksum, key))
+    return matches
+
+def split_budget(total_addresses, workers):
+    """Split the address budget into near-equal shares, one per worker."""
+    share, extra = divmod(total_addresses, workers)
+    return [share + (1 if i < extra else 0) for i in range(workers)]
+
+def split_ranges(ranges, workers):
+    """Share (first counter, count) ranges between workers as evenly as possible."""
+    pending = list(ranges)
+    worker_ranges = []
+    for share in split_budget(sum(count for _, count in ranges), workers):
+        assigned = []
+        while share:
+            counter, count = pending[0]
+            take = min(share, count)
+            assigned.append((counter, take))
+            share -= take
+            if take == count:
+                pending.pop(0)
+            else:
+                pending[0] = (counter + take, count - take)
+        worker_ranges.append(assigned)
+    return worker_ranges
+
+def remaining_ranges(assigned, done):
+    """Return what is left of the assigned ranges once `done` addresses were checked."""
+    remaining = []
+    for counter, count in assigned:
+        skip = min(done, count)
+        done -= skip
+        if skip < count:
+            remaining.append((counter + skip, count - skip))
+    return remaining
+
+def open_match_store(filename):
+    """Open the append-only JSON lines match store, readable by the owner only."""
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+    return os.fdopen(fd, 'a')
+
+def store_match(match_store, matched_terms, address, passphrase):
+    """Append a match to the store, flushed so it survives the process being killed."""
+    match_store.write(json.dumps({
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "patterns": matched_terms,
+        "address": address,
+        "passphrase": passphrase,
+    }) + "\n")
+    match_store.flush()
+
+def write_checkpoint(filename, state):
+    """Atomically replace the checkpoint file with the given state."""
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'w') as f:
+        json.dump(state, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_filename, filename)
+
+def load_checkpoint(filename):
+    """Load a checkpoint written by write_checkpoint."""
+    with open(filename, 'r') as f:
+        state = json.load(f)
+    for key in ("total_addresses", "checked_addresses", "found_addresses", "matches_by_pattern",
+                "remaining", "search_terms"):
+        if key not in state:
+            raise KeyError(key)
+    return state
+
+def checkpoint_loop(checkpoint_file, snapshot, match_store, stop_event, interval):
+    """Background thread: fsync the match store and rewrite the checkpoint every `interval` seconds.
+
+    The snapshot is taken before the fsync, so the checkpoint never covers a match that isn't on disk.
+    """
+    while True:
+        stopping = stop_event.wait(interval)
+        state = snapshot() if checkpoint_file else None
+        if match_store is not None:
+            os.fsync(match_store.fileno())
+        if checkpoint_file:
+            write_checkpoint(checkpoint_file, state)
+        if stopping:
+            return
+
+def report_match(patterns, address, passphrase, found_count):
+    """Display a match and every other pattern it satisfied."""
+    display_match(patterns[0],
+                  address,
+                  passphrase,
+                  found_count,
+                  also_matches=[pattern.label for pattern in patterns[1:]])
+
+def report_loop(report_queue, match_store, display_matches, plan, on_stored=None):
+    """Background thread: derive passphrases, save and print matches without stalling the search.
+
+    on_stored is called with each match's running count once it is written to the match store.
+    At most MAX_DISPLAYED_MATCHES matches are printed per second, the rest are summarised.
+    """
+    window_start = time.monotonic()
+    shown = 0
+    hidden = 0
     while True:
         try:
-            total_addresses = get_number_input("Please enter the number of Algorand keypairs to generate: \n")
+            item = report_queue.get(timeout=1)
+        except queue.Empty:
+            item = ()
+
+        now = time.monotonic()
+        if hidden and (item is None or now - window_start >= 1):
+            where = " (all saved to the match store)" if match_store is not None else ""
+            with tqdm.external_write_mode():
+                print(f"\n... {hidden:,} more matches were not shown{where}")
+            hidden = 0
+        if now - window_start >= 1:
+            window_start = now
+            shown = 0
+        if item is None:
+            return
+        if not item:
+            continue
+
+        pattern_ids, address, private_key, found_count = item
+        passphrase = mnemonic.from_private_key(private_key)
+        if match_store is not None:
+            store_match(match_store, [plan.labels[pattern_id] for pattern_id in pattern_ids], address, passphrase)
+            if on_stored is not None:
+                on_stored(found_count)
+        if not display_matches:
+            continue
+
+        if shown < MAX_DISPLAYED_MATCHES:
+            shown += 1
+            # Pause the progress bar so the match prints cleanly
+            with tqdm.external_write_mode():
+                report_match([plan[pattern_id] for pattern_id in pattern_ids], address, passphrase, found_count)
+        else:
+            hidden += 1
+
+def search_ranges(ranges, master_secret, backend, matcher, timed=False, retired=None, corpus=None,
+                  batch_size=None):
+    """Search the counter ranges, yielding (batch size, matches, timings) after each batch.
+
+    When timed, timings holds the seconds the batch spent in each of METRIC_STAGES,
+    otherwise it is None and nothing is timed.
+    `retired` is a shared (pattern ids, count) pair that lists retired patterns in the
+    order they retired: whenever the count grows, the new ones are dropped from the
+    matcher, in place, before the next batch.
+    With a corpus, the ranges are record numbers and the stored keys are searched instead.
+    Keypairs are generated `batch_size` at a time, by default KEYGEN_BATCH, or VECTOR_BATCH
+    for the vectorized matcher.
+    """
+    keygen = KEYGEN_BACKENDS[backend]
+    batch_size = batch_size or (VECTOR_BATCH if matcher.get("vectorized") else KEYGEN_BATCH)
+    retired_count = 0
+    view = None
+    if corpus is not None:
+        with open(corpus["filename"], 'rb') as f:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        batch_size = CORPUS_BATCH
+    try:
+        for counter, count in ranges:
+            checked = 0
+            while checked < count:
+                if retired is not None and retired[1].value != retired_count:
+                    published = retired[1].value
+                    retire_patterns(matcher, retired[0][retired_count:published])
+                    retired_count = published
+                size = min(batch_size, count - checked)
+                if view is not None:
+                    match_start = time.perf_counter()
+                    matches = search_corpus_batch(view, counter + checked, size, matcher, corpus["key"])
+                    timings = (0.0, 0.0, time.perf_counter() - match_start) if timed else None
+                elif timed:
+                    seeds_start = time.perf_counter()
+                    seeds = next_seeds(master_secret, counter + checked, size)
+                    keygen_start = time.perf_counter()
+                    public_keys = keygen(seeds)
+                    match_start = time.perf_counter()
+                    matches = search_batch(seeds, public_keys, matcher)
+                    timings = (keygen_start - seeds_start, match_start - keygen_start,
+                               time.perf_counter() - match_start)
+                else:
+                    seeds = next_seeds(master_secret, counter + checked, size)
+                    matches = search_batch(seeds, keygen(seeds), matcher)
+                    timings = None
+                yield size, matches, timings
+                checked += size
+    finally:
+        if view is not None:
+            view.close()
+
+def progress_counters(workers):
+    """Shared per-worker counters of addresses checked and seconds spent in each of METRIC_STAGES."""
+    return mp.RawArray('q', workers), mp.RawArray('d', workers * len(METRIC_STAGES))
+
+def count_batch(counters, worker_id, size, timings):
+    """Add a finished batch to a worker's shared counters. Only that worker writes to them, so no lock is needed."""
+    checked, stage_seconds = counters
+    checked[worker_id] += size
+    if timings is not None:
+        offset = worker_id * len(METRIC_STAGES)
+        for stage, elapsed in enumerate(timings):
+            stage_seconds[offset + stage] += elapsed
+
+def search_worker(worker_id, ranges, master_secret, backend, matcher, result_queue, counters, timed=False,
+                  retired=None, corpus=None, batch_size=None, stop=None):
+    """Worker process: search its counter ranges, bumping its shared counters after every batch.
+
+    Matches are streamed to the parent, followed by the worker's running total of addresses
+    checked, so the parent never saves a match without the addresses it came from. Batches
+    without matches only send their total every PROGRESS_MESSAGE_INTERVAL seconds.
+    Once the shared `stop` flag is set, the worker stops after the batch it is on.
+    """
+    # Ctrl+C is handled by the parent, which shuts the workers down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    checked = 0
+    sent = time.monotonic()
+    for size, matches, timings in search_ranges(ranges, master_secret, backend, matcher, timed, retired,
+                                                corpus, batch_size):
+        for match in matches:
+            result_queue.put(("match",) + match)
+        count_batch(counters, worker_id, size, timings)
+        checked += size
+        if matches or time.monotonic() - sent >= PROGRESS_MESSAGE_INTERVAL:
+            result_queue.put(("progress", worker_id, checked))
+            sent = time.monotonic()
+        if stop is not None and stop.value:
             break
-        except ValueError:
-            print("Please enter a valid number.")
+    result_queue.put(("progress", worker_id, checked))
+    result_queue.put(("done", worker_id))
+
+def format_prometheus(metrics):
+    """Render a metrics snapshot in the Prometheus text exposition format."""
+    def quote(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+    lines = [
+        "# HELP vanity_addresses_target Addresses this search will check.",
+        "# TYPE vanity_addresses_target gauge",
+        f"vanity_addresses_target {metrics['total_addresses']}",
+        "# HELP vanity_addresses_checked_total Addresses checked so far.",
+        "# TYPE vanity_addresses_checked_total counter",
+        f"vanity_addresses_checked_total {metrics['checked_addresses']}",
+        "# HELP vanity_matches_found_total Addresses that matched at least one pattern.",
+        "# TYPE vanity_matches_found_total counter",
+        f"vanity_matches_found_total {metrics['found_addresses']}",
+        "# HELP vanity_pattern_matches_total Matches per pattern.",
+        "# TYPE vanity_pattern_matches_total counter",
+    ]
+    for pattern, count in metrics["matches_by_pattern"].items():
+        lines.append(f'vanity_pattern_matches_total{{pattern="{quote(pattern)}"}} {count}')
+
+    lines.append("# HELP vanity_worker_addresses_checked_total Addresses checked per worker.")
+    lines.append("# TYPE vanity_worker_addresses_checked_total counter")
+    for worker in metrics["workers"]:
+        lines.append(f'vanity_worker_addresses_checked_total{{worker="{worker["worker"]}"}} {worker["checked"]}')
+    lines.append("# HELP vanity_worker_rate Addresses per second per worker since the last export.")
+    lines.append("# TYPE vanity_worker_rate gauge")
+    for worker in metrics["workers"]:
+        lines.append(f'vanity_worker_rate{{worker="{worker["worker"]}"}} {worker["rate"]:.1f}')
+    lines.append("# HELP vanity_stage_seconds_total Time spent per pipeline stage per worker.")
+    lines.append("# TYPE vanity_stage_seconds_total counter")
+    for worker in metrics["workers"]:
+        for stage in METRIC_STAGES:
+            lines.append(f'vanity_stage_seconds_total{{worker="{worker["worker"]}",stage="{stage}"}} '
+                         f'{worker[stage + "_seconds"]:.6f}')
+    return "\n".join(lines) + "\n"
+
+def write_metrics(filename, metrics_format, metrics):
+    """Export a metrics snapshot, as a Prometheus textfile or an appended JSON line."""
+    if metrics_format == "jsonl":
+        with open(filename, 'a') as f:
+            f.write(json.dumps(metrics) + "\n")
+        return
+
+    # The textfile collector must never read a half written file
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'w') as f:
+        f.write(format_prometheus(metrics))
+    os.replace(temp_filename, filename)
+
+def metrics_loop(filename, metrics_format, snapshot, stop_event, interval):
+    """Background thread: export metrics every `interval` seconds, with per-worker rates."""
+    previous = None
+    while True:
+        stopping = stop_event.wait(interval)
+        metrics = snapshot()
+        for worker in metrics["workers"]:
+            if previous is None:
+                worker["rate"] = 0.0
+            else:
+                before = previous["workers"][worker["worker"]]["checked"]
+                worker["rate"] = (worker["checked"] - before) / (metrics["time"] - previous["time"])
+        write_metrics(filename, metrics_format, metrics)
+        previous = metrics
+        if stopping:
+            return
+
+def progress_status(found, matches_by_pattern, hit_probability, remaining, rate):
+    """Describe the matches so far and the time to a hit, for the progress bar or a progress line."""
+    parts = []
+    if found is not None:
+        top = heapq.nlargest(PROGRESS_TOP_PATTERNS, matches_by_pattern.items(), key=lambda item: item[1])
+        named = [f"{label} {count:,}" for label, count in top]
+        if len(matches_by_pattern) > len(top):
+            named.append(f"+{len(matches_by_pattern) - len(top):,} more")
+        parts.append(f"{found:,} matches" + (f" ({', '.join(named)})" if named else ""))
+    if hit_probability:
+        parts.append(f"exp. hits left {remaining * hit_probability:,.1f}")
+        parts.append(f"50% hit {format_duration(time_to_chance(0.5, hit_probability, rate))}")
+        parts.append(f"90% hit {format_duration(time_to_chance(0.9, hit_probability, rate))}")
+    return ", ".join(parts)
+
+def progress_loop(status, total_addresses, initial, stop_event, pbar=None, log_interval=None, desc="Searching"):
+    """Background thread: show progress every PROGRESS_REFRESH seconds until `stop_event` is set.
+
+    `status` returns the addresses checked so far, the matching addresses (None when
+    nothing is matched), matches per pattern and the chance of a hit per address.
+    With a log interval, a summary line is printed that often instead of redrawing the bar.
+    """
+    started = time.monotonic()
+    while True:
+        stopping = stop_event.wait(log_interval or PROGRESS_REFRESH)
+        checked, found, matches_by_pattern, hit_probability = status()
+        rate = (checked - initial) / max(time.monotonic() - started, 1e-9)
+        remaining = max(total_addresses - checked, 0)
+        line = progress_status(found, matches_by_pattern, hit_probability, remaining, rate)
+        if log_interval:
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {desc}: {checked:,}/{total_addresses:,} "
+                  f"({checked / total_addresses:.1%}), {rate:,.0f} addr/s, "
+                  f"done in {format_duration(remaining / rate) if rate else 'unknown'}"
+                  f"{', ' + line if line else ''}", flush=True)
+        else:
+            pbar.set_postfix_str(line, refresh=False)
+            if not pbar.update(checked - pbar.n):
+                pbar.refresh()
+        if stopping:
+            return
+
+def run_search(total_addresses, plan, workers=1, progress=True,
+               backend="nacl", vectorized=False, master_secret=None, counter_start=0,
+               ranges=None, resumed=None, match_store=None, checkpoint_file=None, job=None,
+               checkpoint_interval=CHECKPOINT_INTERVAL, display_matches=True, probabilities=None,
+               metrics_file=None, metrics_format="prom", metrics_interval=METRICS_INTERVAL,
+               max_matches=None, matches_per_pattern=None, max_seconds=None, corpus=None, batch_size=None,
+               log_interval=None):
+    """Generate and search addresses, returning (checked, found, matches_by_pattern).
+
+    With a master secret, seeds are derived for counters counter_start..counter_start+total-1
+    instead of drawn at random, so the same range always yields the same keys. A resumed
+    search passes the checkpoint's remaining ranges and counts instead. With a corpus
+    from open_corpus, its stored records 0..total-1 are searched and nothing is generated.
+    Matches are saved and printed by a reporter thread, so the search never waits on I/O.
+    Workers bump shared counters once per batch, and a display thread redraws the bar from
+    them with the rate, matches per pattern and, given each pattern's match probability,
+    a live ETA to a hit. With a log interval it prints a progress line that often instead.
+    The search stops early after max_matches matching addresses or max_seconds. A pattern
+    with matches_per_pattern matches is retired from the matcher, so the rest of the search
+    gets cheaper, and the search stops once every pattern is retired.
+    With a metrics file, per-worker stage timings are collected and exported periodically.
+    batch_size overrides how many keypairs each worker generates and matches at a time.
+    Ctrl+C stops the search early and returns what was found so far. Stopped workers
+    finish the batch they are on first, so no match they found is lost.
+    """
+    if vectorized:
+        matcher = compile_vector_matcher(plan)
+    else:
+        matcher = compile_matcher(plan)
+
+    if ranges is None:
+        ranges = [(counter_start, total_addresses)]
+    resumed = resumed or {}
+    state = {
+        "checked_addresses": resumed.get("checked_addresses", 0),
+        "found_addresses": resumed.get("found_addresses", 0),
+        "matches_by_pattern": dict(resumed.get("matches_by_pattern", {})),
+    }
+    # Matches written to the match store so far, which a checkpoint must not get ahead of
+    state["stored_addresses"] = state["found_addresses"]
+    worker_ranges = split_ranges(ranges, workers)
+    done = [0] * workers
+    counters = progress_counters(workers)
+    timed = metrics_file is not None
+    lock = threading.Lock()
+    stored = threading.Condition(lock)
+
+    labels = plan.labels
+    label_ids = {}
+    for pattern_id, label in enumerate(labels):
+        label_ids.setdefault(label, []).append(pattern_id)
+    retired_ids = set()
+    retired = None
+    if matches_per_pattern:
+        # Shared with the workers: retired pattern ids in order and how many there are,
+        # so each worker only drops the ones it hasn't seen yet
+        retired = (mp.RawArray('i', len(labels)), mp.RawValue('i', 0))
+    hit_probability = combined_probability(probabilities) if probabilities else None
+    started = time.monotonic()
+
+    def retire_satisfied(matched_terms):
+        nonlocal hit_probability
+        # Patterns can share a label, so each id is only taken once
+        newly_retired = list(dict.fromkeys(pattern_id for label in matched_terms
+                                           if state["matches_by_pattern"].get(label, 0) >= matches_per_pattern
+                                           for pattern_id in label_ids.get(label, []) if pattern_id not in retired_ids))
+        if not newly_retired:
+            return
+        count = retired[1].value
+        for pattern_id in newly_retired:
+            retired_ids.add(pattern_id)
+            retired[0][count] = pattern_id
+            count += 1
+        # Published after the ids, so a worker never reads a slot that isn't filled in yet
+        retired[1].value = count
+        if probabilities:
+            # Take each retired pattern out of the chance of a miss, without going over every pattern again
+            miss = 1 - hit_probability
+            for pattern_id in newly_retired:
+                if probabilities[pattern_id] >= 1:
+                    miss = 1 - combined_probability([probability for pattern_id, probability
+                                                     in enumerate(probabilities) if pattern_id not in retired_ids])
+                    break
+                miss /= 1 - probabilities[pattern_id]
+            hit_probability = max(0.0, 1 - min(miss, 1.0))
+
+    def stop_reason():
+        if max_matches and state["found_addresses"] >= max_matches:
+            return f"found {state['found_addresses']:,} matching addresses"
+        if retired is not None and len(retired_ids) == len(labels):
+            return f"every pattern has {matches_per_pattern:,} match(es)"
+        if max_seconds and time.monotonic() - started >= max_seconds:
+            return f"reached the {format_duration(max_seconds)} time limit"
+        return None
+
+    def record_progress(worker_id, checked):
+        with lock:
+            state["checked_addresses"] += checked - done[worker_id]
+            done[worker_id] = checked
+
+    def record_match(pattern_ids, address, private_key):
+        matched_terms = [labels[pattern_id] for pattern_id in pattern_ids]
+        with lock:
+            state["found_addresses"] += 1
+            matches_by_pattern = state["matches_by_pattern"]
+            for matched_term in matched_terms:
+                matches_by_pattern[matched_term] = matches_by_pattern.get(matched_term, 0) + 1
+            found_count = state["found_addresses"]
+            if retired is not None:
+                retire_satisfied(matched_terms)
+        report_queue.put((pattern_ids, address, private_key, found_count))
+
+    resumed_checked = state["checked_addresses"]
+
+    def live_status():
+        # The shared counters run ahead of the recorded progress, which waits for each worker's message
+        with lock:
+            found = state["found_addresses"]
+            matches_by_pattern = dict(state["matches_by_pattern"])
+            probability = hit_probability
+        return resumed_checked + sum(counters[0]), found, matches_by_pattern, probability
+
+    def record_stored(found_count):
+        with stored:
+            state["stored_addresses"] = found_count
+            stored.notify_all()
+
+    def snapshot():
+        with stored:
+            checkpoint = dict(job or {},
+                              total_addresses=total_addresses,
+                              checked_addresses=state["checked_addresses"],
+                              found_addresses=state["found_addresses"],
+                              matches_by_pattern=dict(state["matches_by_pattern"]),
+                              remaining=[list(r) for assigned, n in zip(worker_ranges, done)
+                                         for r in remaining_ranges(assigned, n)])
+            # Matches still queued for the reporter are inside the ranges this checkpoint skips,
+            # so wait until they are saved or a crash would lose them for good
+            while (match_store is not None and state["stored_addresses"] < checkpoint["found_addresses"]
+                   and reporter.is_alive()):
+                stored.wait(1)
+            return checkpoint
+
+    report_queue = queue.Queue(maxsize=REPORT_QUEUE_SIZE)
+    reporter = threading.Thread(target=report_loop,
+                                args=(report_queue, match_store, display_matches, plan, record_stored),
+                                daemon=True)
+    reporter.start()
+
+    def metrics_snapshot():
+        with lock:
+            workers_metrics = []
+            for worker_id in range(workers):
+                worker_metrics = {"worker": worker_id, "checked": counters[0][worker_id]}
+                offset = worker_id * len(METRIC_STAGES)
+                for stage, name in enumerate(METRIC_STAGES):
+                    worker_metrics[name + "_seconds"] = counters[1][offset + stage]
+                workers_metrics.append(worker_metrics)
+            return {
+                "time": time.time(),
+                "total_addresses": total_addresses,
+                "checked_addresses": state["checked_addresses"],
+                "found_addresses": state["found_addresses"],
+                "matches_by_pattern": dict(state["matches_by_pattern"]),
+                "workers": workers_metrics,
+            }
+
+    stop_event = threading.Event()
+    exporter = None
+    if metrics_file:
+        exporter = threading.Thread(target=metrics_loop,
+                                    args=(metrics_file, metrics_format, metrics_snapshot, stop_event,
+                                          metrics_interval),
+                                    daemon=True)
+        exporter.start()
+
+    checkpointer = None
+    if checkpoint_file or match_store is not None:
+        checkpointer = threading.Thread(target=checkpoint_loop,
+                                        args=(checkpoint_file, snapshot, match_store, stop_event,
+                                              checkpoint_interval),
+                                        daemon=True)
+        checkpointer.start()
+
+    if retired is not None:
+        # Patterns that met their quota before a resume stay retired
+        retire_satisfied(list(state["matches_by_pattern"]))
+
+    processes = []
+    stopped = None
+    try:
+        with tqdm(total=total_addresses, initial=state["checked_addresses"], desc="Generating addresses",
+                  unit="addr", disable=not progress or bool(log_interval)) as pbar:
+            display_stop = threading.Event()
+            display = None
+            if progress:
+                display = threading.Thread(target=progress_loop,
+                                           args=(live_status, total_addresses, state["checked_addresses"],
+                                                 display_stop, pbar, log_interval, "Generating addresses"),
+                                           daemon=True)
+                display.start()
+            try:
+                # A resumed search may already have met its stop conditions
+                stopped = stop_reason()
+                if not stopped and workers == 1:
+                    for size, matches, timings in search_ranges(worker_ranges[0], master_secret, backend,
+                                                                matcher, timed, retired, corpus, batch_size):
+                        for match in matches:
+                            record_match(*match)
+                        count_batch(counters, 0, size, timings)
+                        record_progress(0, counters[0][0])
+                        stopped = stop_reason()
+                        if stopped:
+                            break
+                elif not stopped:
+                    result_queue = mp.Queue()
+                    stop_workers = mp.RawValue('b', 0)
+                    for worker_id, assigned in enumerate(worker_ranges):
+                        if assigned:
+                            processes.append(mp.Process(target=search_worker,
+                                                        args=(worker_id, assigned, master_secret, backend,
+                                                              matcher, result_queue, counters, timed, retired,
+                                                              corpus, batch_size, stop_workers),
+                                                        daemon=True))
+                    for process in processes:
+                        process.start()
+
+                    running = len(processes)
+
+                    def receive(timeout):
+                        """Record the next worker message and return it, or None when none came in time."""
+                        nonlocal running
+                        try:
+                            message = result_queue.get(timeout=timeout)
+                        except queue.Empty:
+                            return None
+                        if message[0] == "progress":
+                            record_progress(*message[1:])
+                        elif message[0] == "match":
+                            record_match(*message[1:])
+                        else:
+                            running -= 1
+                        return message
+
+                    try:
+                        while running:
+                            message = receive(1)
+                            if message is None:
+                                # A worker that died without saying "done" must not hang the search
+                                if not any(process.is_alive() for process in processes):
+                                    break
+                            elif message[0] != "progress":
+                                continue
+                            # Only stop on a progress message, so a batch's matches are never counted without it
+                            stopped = stop_reason()
+                            if stopped:
+                                break
+                    finally:
+                        # Workers finish their batch and send its matches before they stop, so none are lost
+                        stop_workers.value = 1
+                        deadline = time.monotonic() + WORKER_STOP_TIMEOUT
+                        try:
+                            while running and time.monotonic() < deadline:
+                                if receive(0.5) is None and not any(process.is_alive() for process in processes):
+                                    break
+                        except KeyboardInterrupt:
+                            pass
+            finally:
+                # One last redraw with the final counts
+                display_stop.set()
+                if display is not None:
+                    display.join()
+        if stopped:
+            print(f"\nSearch stopped early: {stopped}.")
+    except KeyboardInterrupt:
+        print("\nSearch stopped early.")
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        # Let the reporter save every queued match before the final checkpoint
+        report_queue.put(None)
+        reporter.join()
+        # One last flush, checkpoint and metrics export with the final counts
+        stop_event.set()
+        if checkpointer is not None:
+            checkpointer.join()
+        if exporter is not None:
+            exporter.join()
+
+    return state["checked_addresses"], state["found_addresses"], state["matches_by_pattern"]
+
+def create_job_units(job_dir, job, total_addresses, unit_size):
+    """Split a search into work unit files in a shared job directory, returning the unit count.
+
+    Each unit is a checkpoint of its own counter range, so whoever claims it just resumes it.
+    """
+    for name in ("pending", "claimed", "done", "matches"):
+        os.makedirs(os.path.join(job_dir, name), exist_ok=True)
+
+    units = 0
+    counter = job["counter_start"]
+    for first in range(0, total_addresses, unit_size):
+        count = min(unit_size, total_addresses - first)
+        write_checkpoint(os.path.join(job_dir, "pending", f"unit-{units:06d}.json"),
+                         dict(job, counter_start=counter + first, total_addresses=count, checked_addresses=0,
+                              found_addresses=0, matches_by_pattern={}, remaining=[[counter + first, count]]))
+        units += 1
+    # Written last, so workers never see a job with missing units
+    write_checkpoint(os.path.join(job_dir, "job.json"),
+                     dict(job, total_addresses=total_addresses, units=units, unit_size=unit_size))
+    return units
+
+def claim_unit(job_dir):
+    """Claim the next pending work unit, returning its path in claimed/ or None when none are left.
+
+    Claiming is an atomic rename, so two workers can never claim the same unit.
+    """
+    for name in sorted(os.listdir(os.path.join(job_dir, "pending"))):
+        claimed = os.path.join(job_dir, "claimed", name)
+        try:
+            os.rename(os.path.join(job_dir, "pending", name), claimed)
+            # A rename keeps the old modification time, which would make the claim look stale
+            os.utime(claimed)
+        except FileNotFoundError:
+            continue  # Another worker got there first
+        return claimed
+    return None
+
+def read_units(job_dir, folder):
+    """Load every unit checkpoint in one of the job's folders, skipping any being rewritten."""
+    units = {}
+    folder_path = os.path.join(job_dir, folder)
+    for name in os.listdir(folder_path):
+        if not name.endswith(".json"):
+            continue
+        try:
+            units[name] = load_checkpoint(os.path.join(folder_path, name))
+        except (OSError, ValueError, KeyError):
+            continue
+    return units
+
+def requeue_stale_units(job_dir, stale_after):
+    """Put claimed units whose worker stopped saving progress back in the queue, returning how many."""
+    requeued = 0
+    now = time.time()
+    for name in os.listdir(os.path.join(job_dir, "claimed")):
+        claimed = os.path.join(job_dir, "claimed", name)
+        try:
+            if not name.endswith(".json") or now - os.path.getmtime(claimed) < stale_after:
+                continue
+            os.rename(claimed, os.path.join(job_dir, "pending", name))
+        except FileNotFoundError:
+            continue
+        requeued += 1
+    return requeued
+
+def merge_units(units):
+    """Add up the counts of several unit checkpoints."""
+    checked = 0
+    found = 0
+    matches_by_pattern = {}
+    for state in units:
+        checked += state["checked_addresses"]
+        found += state["found_addresses"]
+        for pattern, count in state["matches_by_pattern"].items():
+            matches_by_pattern[pattern] = matches_by_pattern.get(pattern, 0) + count
+    return checked, found, matches_by_pattern
+
+def coordinate_job(job_dir, stale_after=STALE_CLAIM_SECONDS, output_file=None, log_interval=None):
+    """Follow a shared job until every unit is done, requeueing abandoned units, then merge the results.
+
+    With a log interval, a progress line is printed that often instead of showing a bar.
+    """
+    try:
+        with open(os.path.join(job_dir, "job.json"), 'r') as f:
+            job = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error loading job: {str(e)}")
+        return 1
+
+    total_addresses = job["total_addresses"]
+    started = time.time()
+    logged = time.monotonic()
+    try:
+        with tqdm(total=total_addresses, desc="Job progress", unit="addr", disable=bool(log_interval)) as pbar:
+            while True:
+                requeued = requeue_stale_units(job_dir, stale_after)
+                if requeued:
+                    with tqdm.external_write_mode():
+                        print(f"Requeued {requeued:,} abandoned unit(s)")
+                done = read_units(job_dir, "done")
+                claimed = read_units(job_dir, "claimed")
+                checked, found, matches_by_pattern = merge_units(list(done.values()) + list(claimed.values()))
+                units = f"units {len(done):,}/{job['units']:,} done, {len(claimed):,} running, {found:,} matches"
+                finished = len(done) >= job["units"]
+                if not log_interval:
+                    pbar.update(checked - pbar.n)
+                    pbar.set_postfix_str(units, refresh=True)
+                elif finished or time.monotonic() - logged >= log_interval:
+                    logged = time.monotonic()
+                    print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} Job progress: {checked:,}/{total_addresses:,} "
+                          f"({checked / total_addresses:.1%}), {units}", flush=True)
+                if finished:
+                    break
+                time.sleep(COORDINATOR_POLL)
+    except KeyboardInterrupt:
+        print("\nStopped following the job. Workers keep going, follow it again with the same --coordinate.")
+
+    checked, found, matches_by_pattern = merge_units(read_units(job_dir, "done").values())
+    print("\n" + "="*50)
+    print("Job Results".center(50))
+    print("="*50)
+    print(f"Units Done: {len(read_units(job_dir, 'done')):,} of {job['units']:,}")
+    print(f"Total Addresses Checked: {checked:,}")
+    print(f"Total Matches Found: {found:,}")
+    print("-"*50)
+    print("Matches by Pattern:")
+    for pattern, count in matches_by_pattern.items():
+        print(f"  {pattern}: {count}")
+    print("-"*50)
+    print(f"Matches are saved in '{os.path.join(job_dir, 'matches')}'")
+    print("="*50)
+
+    if output_file:
+        try:
+            write_summary(output_file, {
+                "complete": checked >= total_addresses,
+                "total_addresses": total_addresses,
+                "checked_addresses": checked,
+                "found_addresses": found,
+                "matches_by_pattern": matches_by_pattern,
+                "elapsed_seconds": round(time.time() - started, 3),
+                "match_store": os.path.abspath(os.path.join(job_dir, "matches")),
+            })
+        except OSError as e:
+            print(f"Error writing summary: {str(e)}")
+            return 1
+    return 0
+
+def join_job(job_dir, worker_name, workers=1, checkpoint_interval=CHECKPOINT_INTERVAL, display_matches=True,
+             batch_size=None, profile_file=None, log_interval=None):
+    """Search the units of a shared job one after another until none are left.
+
+    A unit is searched as a resumed checkpoint, so its progress is saved where the
+    coordinator can see it, and a unit that is stopped goes back to the queue.
+    Each unit uses this host's calibrated batch size from the profile file, if any.
+    """
+    if not os.path.exists(os.path.join(job_dir, "job.json")):
+        print(f"Error: No job found in '{job_dir}'.")
+        return 1
+
+    match_store_file = os.path.join(job_dir, "matches", f"{worker_name}.jsonl")
+    searched = 0
+    while True:
+        claimed = claim_unit(job_dir)
+        if claimed is None:
+            break
+        print(f"\n{worker_name}: searching {os.path.basename(claimed)}")
+        status = main(workers=workers, resume_file=claimed, match_store_file=match_store_file,
+                      checkpoint_interval=checkpoint_interval, display_matches=display_matches, headless=True,
+                      batch_size=batch_size, profile_file=profile_file, log_interval=log_interval)
+
+        try:
+            state = load_checkpoint(claimed)
+        except (OSError, ValueError, KeyError):
+            state = None
+        if status == 0 and state is not None and not state["remaining"]:
+            os.replace(claimed, os.path.join(job_dir, "done", os.path.basename(claimed)))
+            searched += 1
+            continue
+
+        # Stopped or failed: hand the unit back so another worker can carry on from its checkpoint
+        if os.path.exists(claimed):
+            os.rename(claimed, os.path.join(job_dir, "pending", os.path.basename(claimed)))
+        print(f"{worker_name}: stopped, {searched:,} unit(s) searched")
+        return status or 1
+
+    print(f"{worker_name}: no units left, {searched:,} unit(s) searched")
+    return 0
+
+def available_cpus():
+    """Return how many CPUs this process may run on, hyperthreads included."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def measure_workers_rate(workers, backend, matcher, batch_size, seconds=CALIBRATE_SECONDS):
+    """Measure addresses/sec for `workers` search processes, leaving out their start-up time."""
+    result_queue = mp.Queue()
+    counters = progress_counters(workers)
+    processes = [mp.Process(target=search_worker,
+                            args=(worker_id, [(0, 1 << 62)], None, backend, matcher, result_queue, counters, False,
+                                  None, None, batch_size),
+                            daemon=True)
+                 for worker_id in range(workers)]
+    for process in processes:
+        process.start()
+
+    checked = counters[0]
+    try:
+        # Counting starts once every worker has finished its first batch
+        while not all(checked):
+            if not all(process.is_alive() for process in processes):
+                raise RuntimeError("a search worker stopped while calibrating")
+            time.sleep(0.01)
+        start = time.perf_counter()
+        before = sum(checked)
+        time.sleep(seconds)
+        return (sum(checked) - before) / (time.perf_counter() - start)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+def calibrate_host(plan, seconds=CALIBRATE_SECONDS, workers=None, backend=None, vectorized=None, batch_size=None):
+    """Find the fastest settings for searching this plan on this host.
+
+    Backends are compared first, then matchers and batch sizes with the best backend,
+    all in one process. The winner is then run with one process, one per physical core
+    (half the CPUs, when there are hyperthreads) and one per CPU. Settings that are
+    passed in are kept as they are. Returns the settings with their measured rate.
+    """
+    backends = [backend] if backend else [name for name in sorted(KEYGEN_BACKENDS) if verify_keygen_backend(name)]
+    if vectorized is None:
+        matchers = [False, True] if np is not None else [False]
+    else:
+        matchers = [vectorized]
+    compiled = {False: compile_matcher(plan)}
+    if True in matchers:
+        compiled[True] = compile_vector_matcher(plan)
+    cpus = available_cpus()
+    worker_counts = [workers] if workers else sorted({1, max(1, cpus // 2), cpus})
+
+    print("\n" + "="*60)
+    print("Calibrating".center(60))
+    print("="*60)
+    print(f"Patterns: {len(plan):,}, CPUs: {cpus}, {seconds:g} seconds per setting")
+    print("-"*60)
+    print("| {:<12} | {:<10} | {:>6} | {:>7} | {:>12} |".format("Backend", "Matcher", "Batch", "Workers", "Addr/sec"))
+    print("-"*60)
+
+    def measure(name, use_vector, size, count):
+        if count == 1:
+            rate = measure_search_rate(name, compiled[use_vector], seconds, batch_size=size)
+        else:
+            rate = measure_workers_rate(count, name, compiled[use_vector], size, seconds)
+        print("| {:<12} | {:<10} | {:>6,} | {:>7} | {:>12,.0f} |".format(
+            name, "vectorized" if use_vector else "scalar", size, count, rate))
+        return rate
+
+    def batch_sizes(use_vector):
+        if batch_size:
+            return [batch_size]
+        return CALIBRATE_VECTOR_BATCHES if use_vector else CALIBRATE_SCALAR_BATCHES
+
+    default_vector = matchers[0]
+    default_size = batch_size or (VECTOR_BATCH if default_vector else KEYGEN_BATCH)
+    if len(backends) > 1:
+        best_backend = max(backends, key=lambda name: measure(name, default_vector, default_size, 1))
+    else:
+        best_backend = backends[0]
+
+    options = [(use_vector, size) for use_vector in matchers for size in batch_sizes(use_vector)]
+    rates = {option: measure(best_backend, option[0], option[1], 1) for option in options}
+    best_vector, best_size = max(rates, key=rates.get)
+
+    rates = {1: rates[(best_vector, best_size)]}
+    for count in worker_counts:
+        if count not in rates:
+            rates[count] = measure(best_backend, best_vector, best_size, count)
+    best_workers = max((count for count in rates if count in worker_counts), key=rates.get)
+    print("="*60)
+
+    return {
+        "workers": best_workers,
+        "backend": best_backend,
+        "vectorized": best_vector,
+        "batch_size": best_size,
+        "rate": round(rates[best_workers], 1),
+        "cpus": cpus,
+        "patterns": len(plan),
+        "calibrated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
 
-    searchterms, nums, positions, exclude_lasts = get_search_terms(total_addresses)
+def load_profiles(filename):
+    """Load every host's calibrated settings from a profile file, or {} when there is none."""
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, 'r') as f:
+        return json.load(f).get("hosts", {})
+
+def load_profile(filename):
+    """Return the calibrated settings for this host, or None."""
+    try:
+        return load_profiles(filename).get(socket.gethostname())
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"Warning: Ignoring the profile '{filename}': {e}")
+        return None
+
+def save_profile(filename, settings):
+    """Store this host's calibrated settings in the profile file, keeping those of other hosts."""
+    try:
+        profiles = load_profiles(filename)
+    except (OSError, ValueError, AttributeError):
+        profiles = {}
+    profiles[socket.gethostname()] = settings
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'w') as f:
+        json.dump({"hosts": profiles}, f, indent=2)
+    os.replace(temp_filename, filename)
+
+def main(workers=None, backend=None, wordlist=None, min_word_length=WORDLIST_MIN_LENGTH, vectorized=None,
+         master_secret_file=None, counter_start=0, checkpoint_file=None, match_store_file=None,
+         resume_file=None, checkpoint_interval=CHECKPOINT_INTERVAL, display_matches=True,
+         metrics_file=None, metrics_format="prom", metrics_interval=METRICS_INTERVAL,
+         total_addresses=None, terms_file=None, output_file=None, headless=False,
+         max_matches=None, matches_per_pattern=None, max_seconds=None,
+         build_corpus_file=None, corpus_file=None, corpus_passphrase_file=None,
+         coordinate_dir=None, join_dir=None, unit_size=UNIT_SIZE, stale_after=STALE_CLAIM_SECONDS,
+         worker_name=None, batch_size=None, profile_file=None, calibrate=False,
+         calibrate_seconds=CALIBRATE_SECONDS, log_interval=None):
+    """Run one search, or build a corpus, and return an exit status.
+
+    Headless runs take everything from the arguments: no logo, no prompts and no speed
+    measurement before the search, so jobs can be scripted and launched back to back.
+    A coordinator splits the search into work units in a shared directory, and the
+    processes that join it search them.
+    Settings left as None come from this host's entry in the profile file, if there is
+    one, and calibrating writes that entry instead of searching.
+    With a log interval, progress is printed as a line that often instead of a bar.
+    """
+    if not headless:
+        display_logo()
+
+    requested = {"workers": workers, "backend": backend, "vectorized": vectorized, "batch_size": batch_size}
+    profile = load_profile(profile_file) if profile_file and not calibrate else None
+    calibrated = []
+    if profile:
+        if workers is None and profile.get("workers"):
+            workers = profile["workers"]
+            calibrated.append(f"{workers} worker(s)")
+        if backend is None and profile.get("backend") in KEYGEN_BACKENDS:
+            backend = profile["backend"]
+            calibrated.append(f"{backend} keygen")
+    workers = workers or 1
+    backend = backend or "nacl"
+
+    if join_dir:
+        return join_job(join_dir, worker_name or f"{socket.gethostname()}-{os.getpid()}", workers,
+                        checkpoint_interval, display_matches, batch_size, profile_file, log_interval)
+    if coordinate_dir and os.path.exists(os.path.join(coordinate_dir, "job.json")):
+        print(f"Following the existing job in '{coordinate_dir}'")
+        return coordinate_job(coordinate_dir, stale_after, output_file, log_interval)
+
+    resumed = None
+    ranges = None
+    if resume_file:
+        try:
+            resumed = load_checkpoint(resume_file)
+        except json.JSONDecodeError:
+            print("Error: Invalid JSON format in checkpoint file.")
+            return 1
+        except KeyError as e:
+            print(f"Error: Missing required field {e} in checkpoint file.")
+            return 1
+        except OSError as e:
+            print(f"Error loading checkpoint: {str(e)}")
+            return 1
+
+        # The checkpoint decides the job, so a resumed search carries on exactly where it stopped
+        total_addresses = resumed["total_addresses"]
+        try:
+            plan = SearchPlan.from_json(resumed["search_terms"])
+        except (KeyError, ValueError) as e:
+            print(f"Error: Invalid search terms in checkpoint file: {e}")
+            return 1
+        backend = resumed.get("backend", backend)
+        vectorized = resumed.get("vectorized", vectorized)
+        master_secret_file = resumed.get("master_secret_file")
+        match_store_file = match_store_file or resumed.get("match_store")
+        counter_start = resumed.get("counter_start", 0)
+        corpus_file = resumed.get("corpus")
+        corpus_passphrase_file = corpus_passphrase_file or resumed.get("corpus_passphrase_file")
+        max_matches = max_matches or resumed.get("max_matches")
+        matches_per_pattern = matches_per_pattern or resumed.get("matches_per_pattern")
+        checkpoint_file = resume_file
+        ranges = [tuple(r) for r in resumed["remaining"]]
+
+    if profile:
+        if (vectorized is None and profile.get("vectorized") is not None
+                and (np is not None or not profile["vectorized"])):
+            vectorized = profile["vectorized"]
+            calibrated.append("vectorized matcher" if vectorized else "scalar matcher")
+        # A batch size is only tuned for the matcher it was measured with
+        if batch_size is None and profile.get("batch_size") and profile.get("vectorized") == bool(vectorized):
+            batch_size = profile["batch_size"]
+            calibrated.append(f"batches of {batch_size:,}")
+        if calibrated:
+            print(f"Using the calibrated settings for this host from '{profile_file}': {', '.join(calibrated)}")
+    vectorized = bool(vectorized)
+
+    if vectorized and np is None:
+        print("Error: The vectorized matcher needs numpy, install it with: pip install numpy")
+        return 1
+
+    if not verify_keygen_backend(backend):
+        print(f"Error: The '{backend}' keygen backend does not reproduce algosdk keys.")
+        return 1
+
+    master_secret = None
+    if master_secret_file:
+        try:
+            master_secret = load_master_secret(master_secret_file)
+        except (OSError, ValueError) as e:
+            print(f"Error loading master secret: {str(e)}")
+            return 1
+
+    passphrase = None
+    if corpus_passphrase_file:
+        try:
+            with open(corpus_passphrase_file, 'r') as f:
+                passphrase = f.read().strip()
+        except OSError as e:
+            print(f"Error loading corpus passphrase: {str(e)}")
+            return 1
+        if not passphrase:
+            print(f"Error: The corpus passphrase file '{corpus_passphrase_file}' is empty.")
+            return 1
+
+    if build_corpus_file:
+        while total_addresses is None:
+            try:
+                total_addresses = get_number_input("Please enter the number of Algorand keypairs to generate: \n")
+            except ValueError:
+                print("Please enter a valid number.")
+        print(f"\nAdding {total_addresses:,} addresses to the corpus '{build_corpus_file}'"
+              f"{' with encrypted seeds' if passphrase else ''}")
+        try:
+            added = build_corpus(build_corpus_file, total_addresses, workers, backend, passphrase, master_secret,
+                                 counter_start, log_interval=log_interval)
+            records = read_corpus_header(build_corpus_file)[0]
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"Corpus '{build_corpus_file}' now holds {records:,} addresses.")
+        return 0 if added else 1
+
+    corpus = None
+    if corpus_file:
+        try:
+            corpus = open_corpus(corpus_file, passphrase)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return 1
+        if total_addresses is None or total_addresses > corpus["records"]:
+            total_addresses = corpus["records"]
+        if not total_addresses:
+            print(f"Error: The corpus '{corpus_file}' is empty.")
+            return 1
+        print(f"\nSearching the {total_addresses:,} stored addresses in '{corpus_file}'")
+
+    if resumed:
+        print(f"\nResuming from '{resume_file}': {resumed['checked_addresses']:,} of "
+              f"{total_addresses:,} addresses checked, {resumed['found_addresses']:,} matches found")
+        if not ranges:
+            print("This search is already complete.")
+            return 0
+        display_search_terms(plan, total_addresses)
+    else:
+        # Calibrating only needs the patterns, not a budget
+        while total_addresses is None and not calibrate:
+            try:
+                total_addresses = get_number_input("Please enter the number of Algorand keypairs to generate: \n")
+            except ValueError:
+                print("Please enter a valid number.")
+
+        if wordlist:
+            plan = load_wordlist(wordlist, min_word_length, total_addresses)
+            if not plan:
+                return 1
+        elif terms_file:
+            plan = read_search_terms(terms_file)
+            if not plan:
+                return 1
+            if not headless:
+                display_search_terms(plan, total_addresses)
+        else:
+            plan = get_search_terms(total_addresses)
+
+    # Catch patterns that could never match before searching for them forever
+    try:
+        if vectorized:
+            matcher = compile_vector_matcher(plan)
+        else:
+            matcher = compile_matcher(plan)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if calibrate:
+        settings = calibrate_host(plan, calibrate_seconds, **requested)
+        print(f"\nFastest on this host: {settings['workers']} worker(s), {settings['backend']} keygen, "
+              f"{'vectorized' if settings['vectorized'] else 'scalar'} matcher, "
+              f"batches of {settings['batch_size']:,} at {settings['rate']:,.0f} addresses/sec")
+        try:
+            save_profile(profile_file, settings)
+        except OSError as e:
+            print(f"Error saving profile: {str(e)}")
+            return 1
+        print(f"Saved to '{profile_file}', later runs on this host use these settings automatically.")
+        return 0
+
+    if checkpoint_file and not match_store_file:
+        match_store_file = os.path.splitext(checkpoint_file)[0] + ".matches.jsonl"
+
+    job = {
+        "search_terms": plan.to_json(),
+        "backend": backend,
+        "vectorized": vectorized,
+        "counter_start": counter_start,
+        "master_secret_file": os.path.abspath(master_secret_file) if master_secret_file else None,
+        "match_store": os.path.abspath(match_store_file) if match_store_file else None,
+        "max_matches": max_matches,
+        "matches_per_pattern": matches_per_pattern,
+        "corpus": os.path.abspath(corpus_file) if corpus_file else None,
+        "corpus_passphrase_file": os.path.abspath(corpus_passphrase_file) if corpus_passphrase_file else None,
+    }
+
+    if coordinate_dir:
+        # Every worker keeps its own match store in the job directory
+        job["match_store"] = None
+        try:
+            units = create_job_units(coordinate_dir, job, total_addresses, unit_size)
+        except OSError as e:
+            print(f"Error creating job: {str(e)}")
+            return 1
+        print(f"\nSplit {total_addresses:,} addresses into {units:,} work units in '{coordinate_dir}'")
+        print(f"Start workers with: --join {coordinate_dir}")
+        return coordinate_job(coordinate_dir, stale_after, output_file, log_interval)
+
+    match_store = None
+    if match_store_file:
+        try:
+            match_store = open_match_store(match_store_file)
+        except OSError as e:
+            print(f"Error opening match store: {str(e)}")
+            return 1
     
-    display_pattern_visual(searchterms, nums, positions, exclude_lasts)
+    if not headless:
+        display_pattern_visual(plan)
+    if workers > 1:
+        print(f"\nUsing {workers} worker processes")
+    if master_secret is not None:
+        print(f"\nDeriving seeds from the master secret, counters {counter_start:,} "
+              f"to {counter_start + total_addresses - 1:,}")
+    if match_store_file:
+        print(f"\nSaving matches to '{match_store_file}'")
+    if checkpoint_file:
+        print(f"Saving progress to '{checkpoint_file}' every {checkpoint_interval:g} seconds")
+    if metrics_file:
+        print(f"Exporting metrics to '{metrics_file}' every {metrics_interval:g} seconds")
+    if max_matches:
+        print(f"Stopping after {max_matches:,} matching addresses")
+    if matches_per_pattern:
+        print(f"Retiring each pattern after {matches_per_pattern:,} match(es)")
+    if max_seconds:
+        print(f"Stopping after {format_duration(max_seconds)}")
+
+    probabilities = pattern_probabilities(plan)
+    if not headless:
+        print("\nMeasuring search speed...")
+        rate = measure_search_rate(backend, matcher, corpus=corpus, batch_size=batch_size) * workers
+        remaining_addresses = sum(count for _, count in ranges) if ranges else total_addresses
+        display_difficulty(plan.labels, probabilities, remaining_addresses, rate)
     print("\nSearching for addresses... Press Ctrl+C to stop")
-    found_addresses = 0
-    checked_addresses = 0
-    matches_by_pattern = {}
+    started = time.time()
 
-    with tqdm(total=total_addresses, desc="Generating addresses", unit="addr") as pbar:
-        while checked_addresses < total_addresses:
-            private_key, address = account.generate_account()
-            checked_addresses += 1
-            
-            found, matched_term = search_address(address, searchterms, nums, positions, exclude_lasts)
-            if found:
-                found_addresses += 1
-                matches_by_pattern[matched_term] = matches_by_pattern.get(matched_term, 0) + 1
-                
-                # Determine if this match used exclude_last
-                exclude_last = "excl. last" in matched_term
-                display_match(matched_term.replace(" (excl. last)", ""), 
-                            address, 
-                            mnemonic.from_private_key(private_key), 
-                            found_addresses,
-                            exclude_last)
-                
-            pbar.update(1)
+    try:
+        checked_addresses, found_addresses, matches_by_pattern = run_search(
+            total_addresses, plan, workers, backend=backend,
+            vectorized=vectorized, master_secret=master_secret, counter_start=counter_start,
+            ranges=ranges, resumed=resumed, match_store=match_store, checkpoint_file=checkpoint_file,
+            job=job, checkpoint_interval=checkpoint_interval, display_matches=display_matches,
+            probabilities=probabilities, metrics_file=metrics_file, metrics_format=metrics_format,
+            metrics_interval=metrics_interval, max_matches=max_matches, matches_per_pattern=matches_per_pattern,
+            max_seconds=max_seconds, corpus=corpus, batch_size=batch_size, log_interval=log_interval)
+    finally:
+        if match_store is not None:
+            match_store.close()
 
-        print("\n" + "="*50)
+    if output_file:
+        summary = {
+            "complete": checked_addresses >= total_addresses,
+            "total_addresses": total_addresses,
+            "checked_addresses": checked_addresses,
+            "found_addresses": found_addresses,
+            "matches_by_pattern": matches_by_pattern,
+            "elapsed_seconds": round(time.time() - started, 3),
+            "match_store": job["match_store"],
+        }
+        if master_secret is not None:
+            summary["next_counter"] = counter_start + total_addresses
+        try:
+            write_summary(output_file, summary)
+        except OSError as e:
+            print(f"Error writing summary: {str(e)}")
+            return 1
+
+    print("\n" + "="*50)
+    if checked_addresses < total_addresses:
+        print("Search Stopped!".center(50))
+    else:
         print("Search Complete!".center(50))
-        print("="*50)
-        print(f"Total Addresses Checked: {checked_addresses:,}")
-        print(f"Total Matches Found: {found_addresses:,}")
+    print("="*50)
+    print(f"Total Addresses Checked: {checked_addresses:,}")
+    print(f"Total Matches Found: {found_addresses:,}")
+    print("-"*50)
+    print("Matches by Pattern:")
+    for pattern, count in matches_by_pattern.items():
+        print(f"  {pattern}: {count}")
+    if checked_addresses < total_addresses and checkpoint_file:
         print("-"*50)
-        print("Matches by Pattern:")
-        for pattern, count in matches_by_pattern.items():
-            print(f"  {pattern}: {count}")
-        print("="*50)
+        print(f"Resume with: --resume {checkpoint_file}")
+    elif master_secret is not None:
+        print("-"*50)
+        print(f"Continue with: --counter-start {counter_start + total_addresses}")
+    print("="*50)
+    return 0
+
+def write_summary(filename, summary):
+    """Write the result of a search as JSON, to stdout for "-", so a scheduler can pick it up."""
+    if filename == "-":
+        print(json.dumps(summary))
+        return
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'w') as f:
+        json.dump(summary, f, indent=2)
+    os.replace(temp_filename, filename)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Algorand Vanity Address Generator",
+                                     epilog="With --addresses and --terms or --wordlist, the search runs "
+                                            "headless: no logo, no prompts and no speed measurement.")
+    parser.add_argument("--addresses", type=int, metavar="N",
+                        help="number of addresses to check, instead of asking")
+    parser.add_argument("--terms", metavar="PATH",
+                        help="load search terms from this JSON file (same format as searchAlgo.json)")
+    parser.add_argument("--output", metavar="PATH",
+                        help="write a JSON summary of the search to this file when it ends ('-' for stdout)")
+    parser.add_argument("--workers", type=int,
+                        help="number of worker processes to search with "
+                             "(0 = one per available CPU, default: calibrated, or 1)")
+    parser.add_argument("--backend", choices=sorted(KEYGEN_BACKENDS),
+                        help="ed25519 library used to generate keypairs (default: calibrated, or nacl)")
+    parser.add_argument("--wordlist", metavar="PATH",
+                        help="search the front and back of addresses for every word in this file")
+    parser.add_argument("--min-word-length", type=int, default=WORDLIST_MIN_LENGTH,
+                        help=f"skip wordlist entries shorter than this (default: {WORDLIST_MIN_LENGTH})")
+    parser.add_argument("--vectorized", action="store_true", default=None,
+                        help="match whole batches of addresses with NumPy (requires numpy)")
+    parser.add_argument("--batch-size", type=int, metavar="N",
+                        help=f"keypairs generated and matched per batch "
+                             f"(default: calibrated, or {KEYGEN_BATCH} and {VECTOR_BATCH:,} vectorized)")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="measure which workers, backend, matcher and batch size search the --terms or "
+                             "--wordlist patterns fastest on this host, and save them to the profile")
+    parser.add_argument("--calibrate-seconds", type=float, default=CALIBRATE_SECONDS,
+                        help=f"seconds each setting is measured for with --calibrate (default: {CALIBRATE_SECONDS:g})")
+    parser.add_argument("--profile", metavar="PATH", default=PROFILE_FILE,
+                        help=f"file that keeps each host's calibrated settings (default: {PROFILE_FILE})")
+    parser.add_argument("--no-profile", action="store_true",
+                        help="ignore the calibrated settings in the profile")
+    parser.add_argument("--master-secret-file", metavar="PATH",
+                        help="derive seeds from the hex master secret in this file (created if missing) "
+                             "so runs can be reproduced and resumed by counter range")
+    parser.add_argument("--counter-start", type=int, default=0,
+                        help="first seed counter to use with --master-secret-file (default: 0)")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="periodically save progress to this file so the search can be resumed")
+    parser.add_argument("--match-store", metavar="PATH",
+                        help="append every match to this JSON lines file "
+                             "(default with --checkpoint: next to the checkpoint)")
+    parser.add_argument("--resume", metavar="PATH",
+                        help="continue the search saved in this checkpoint file")
+    parser.add_argument("--quiet", action="store_true",
+                        help="print a progress line every --log-interval seconds instead of a progress bar, "
+                             "for unattended runs")
+    parser.add_argument("--log-interval", type=float, metavar="SECONDS",
+                        help=f"seconds between progress lines with --quiet (default: {PROGRESS_LOG_INTERVAL})")
+    parser.add_argument("--no-match-display", action="store_true",
+                        help="only save matches to the match store, don't print them")
+    parser.add_argument("--checkpoint-interval", type=float, default=CHECKPOINT_INTERVAL,
+                        help=f"seconds between checkpoints and match store syncs (default: {CHECKPOINT_INTERVAL})")
+    parser.add_argument("--build-corpus", metavar="PATH",
+                        help="generate --addresses keypairs and append them to this corpus file, without searching")
+    parser.add_argument("--corpus", metavar="PATH",
+                        help="search the keypairs stored in this corpus file instead of generating new ones")
+    parser.add_argument("--corpus-passphrase-file", metavar="PATH",
+                        help="passphrase that encrypts the seeds of a new corpus, needed to search it later")
+    parser.add_argument("--coordinate", metavar="DIR",
+                        help="split the search into work units in this shared directory and follow the "
+                             "workers that --join it (or follow the job already in it)")
+    parser.add_argument("--join", metavar="DIR",
+                        help="search work units from the job in this shared directory until none are left")
+    parser.add_argument("--unit-size", type=int, default=UNIT_SIZE,
+                        help=f"addresses per work unit with --coordinate (default: {UNIT_SIZE:,})")
+    parser.add_argument("--stale-after", type=float, default=STALE_CLAIM_SECONDS,
+                        help="seconds without a saved checkpoint before a claimed unit is requeued "
+                             f"(default: {STALE_CLAIM_SECONDS})")
+    parser.add_argument("--worker-name",
+                        help="name of this worker in a joined job (default: host name and process id)")
+    parser.add_argument("--stop-after-matches", type=int, metavar="N",
+                        help="stop once N addresses have matched")
+    parser.add_argument("--matches-per-pattern", type=int, metavar="K",
+                        help="stop searching for a pattern once it has K matches, "
+                             "and stop the search when every pattern has")
+    parser.add_argument("--max-time", type=float, metavar="SECONDS",
+                        help="stop the search after this many seconds")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="export search rate, per-pattern hits and stage timings to this file")
+    parser.add_argument("--metrics-format", choices=["prom", "jsonl"], default="prom",
+                        help="Prometheus textfile (rewritten) or JSON lines (appended) (default: prom)")
+    parser.add_argument("--metrics-interval", type=float, default=METRICS_INTERVAL,
+                        help=f"seconds between metrics exports (default: {METRICS_INTERVAL})")
+    args = parser.parse_args()
+    if args.workers is not None and args.workers < 0:
+        parser.error("--workers must be 0 or a positive number")
+    if args.workers == 0:
+        args.workers = available_cpus()
+    if args.counter_start < 0:
+        parser.error("--counter-start must be 0 or a positive number")
+    for option, value in (("--stop-after-matches", args.stop_after_matches),
+                          ("--matches-per-pattern", args.matches_per_pattern), ("--max-time", args.max_time)):
+        if value is not None and value <= 0:
+            parser.error(f"{option} must be a positive number")
+    if args.metrics_interval <= 0:
+        parser.error("--metrics-interval must be a positive number")
+    if args.checkpoint_interval <= 0:
+        parser.error("--checkpoint-interval must be a positive number")
+    if args.resume and args.checkpoint:
+        parser.error("--resume keeps saving to the checkpoint it resumes from, drop --checkpoint")
+    if args.no_match_display and not (args.match_store or args.checkpoint or args.resume or args.join):
+        parser.error("--no-match-display needs somewhere to save matches, add --match-store or --checkpoint")
+    if args.vectorized and np is None:
+        parser.error("--vectorized needs numpy, install it with: pip install numpy")
+    if args.addresses is not None and args.addresses <= 0:
+        parser.error("--addresses must be a positive number")
+    if args.terms and args.wordlist:
+        parser.error("use either --terms or --wordlist, not both")
+    if args.resume and (args.addresses is not None or args.terms or args.wordlist):
+        parser.error("--resume takes the budget and search terms from the checkpoint")
+    if args.build_corpus and args.corpus:
+        parser.error("use either --build-corpus or --corpus, not both")
+    if args.build_corpus and (args.terms or args.wordlist or args.resume or args.checkpoint):
+        parser.error("--build-corpus only generates keypairs, search the corpus afterwards with --corpus")
+    if args.corpus and (args.master_secret_file or args.counter_start):
+        parser.error("--corpus searches stored keypairs, --master-secret-file and --counter-start don't apply")
+    if args.corpus_passphrase_file and not (args.build_corpus or args.corpus or args.resume):
+        parser.error("--corpus-passphrase-file needs --build-corpus or --corpus")
+    if args.unit_size <= 0:
+        parser.error("--unit-size must be a positive number")
+    if args.stale_after <= 0:
+        parser.error("--stale-after must be a positive number")
+    if args.log_interval is not None and not args.quiet:
+        parser.error("--log-interval needs --quiet")
+    if args.log_interval is not None and args.log_interval <= 0:
+        parser.error("--log-interval must be a positive number")
+    if args.quiet and args.log_interval is None:
+        args.log_interval = PROGRESS_LOG_INTERVAL
+    if args.batch_size is not None and args.batch_size <= 0:
+        parser.error("--batch-size must be a positive number")
+    if args.calibrate_seconds <= 0:
+        parser.error("--calibrate-seconds must be a positive number")
+    if args.calibrate and not (args.terms or args.wordlist):
+        parser.error("--calibrate tunes for your pattern mix, add --terms or --wordlist")
+    if args.calibrate and (args.resume or args.corpus or args.build_corpus or args.coordinate or args.join):
+        parser.error("--calibrate only measures settings, it doesn't search or build anything")
+    if args.calibrate and args.no_profile:
+        parser.error("--calibrate saves to the profile, drop --no-profile")
+    if args.no_profile:
+        args.profile = None
+    if args.coordinate and args.join:
+        parser.error("use either --coordinate or --join, not both")
+    if (args.coordinate or args.join) and (args.resume or args.checkpoint or args.build_corpus):
+        parser.error("--coordinate and --join keep their own checkpoints in the job directory")
+    if (args.coordinate or args.join) and (args.stop_after_matches or args.matches_per_pattern or args.max_time):
+        # Each unit would stop on its own limit and go back to the queue, so the job would never finish
+        parser.error("--stop-after-matches, --matches-per-pattern and --max-time can't be used with "
+                     "--coordinate or --join")
+    args.headless = bool(args.join or args.resume or args.calibrate
+                         or (args.build_corpus and args.addresses is not None)
+                         or ((args.addresses is not None or args.corpus) and (args.terms or args.wordlist)))
+    return args
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    status = main(workers=args.workers, backend=args.backend,
+         wordlist=args.wordlist, min_word_length=args.min_word_length, vectorized=args.vectorized,
+         master_secret_file=args.master_secret_file, counter_start=args.counter_start,
+         checkpoint_file=args.checkpoint, match_store_file=args.match_store, resume_file=args.resume,
+         checkpoint_interval=args.checkpoint_interval, display_matches=not args.no_match_display,
+         metrics_file=args.metrics, metrics_format=args.metrics_format, metrics_interval=args.metrics_interval,
+         total_addresses=args.addresses, terms_file=args.terms, output_file=args.output, headless=args.headless,
+         max_matches=args.stop_after_matches, matches_per_pattern=args.matches_per_pattern, max_seconds=args.max_time,
+         build_corpus_file=args.build_corpus, corpus_file=args.corpus, corpus_passphrase_file=args.corpus_passphrase_file,
+         coordinate_dir=args.coordinate, join_dir=args.join, unit_size=args.unit_size, stale_after=args.stale_after,
+         worker_name=args.worker_name, batch_size=args.batch_size, profile_file=args.profile,
+         calibrate=args.calibrate, calibrate_seconds=args.calibrate_seconds, log_interval=args.log_interval)
+    raise SystemExit(status)
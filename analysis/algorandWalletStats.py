@@ -1,45 +1,252 @@
-from algosdk import account, mnemonic
-from collections import defaultdict
-
-def analyze_first_character():
-    print("Analyzing first character of Algorand addresses...")
-    print("Checking 100,000 addresses")
-    
-    # Track first characters
-    first_chars = defaultdict(int)
-    total = 100_000
-    
-    for i in range(total):
-        _, address = account.generate_account()
-        first_char = address[0]
-        first_chars[first_char] += 1
-    
-    # Print sorted results
-    print("\nFirst character frequencies:")
-    print("-" * 50)
-    for char, count in sorted(first_chars.items(), key=lambda x: x[1], reverse=True):
-        percentage = (count/total) * 100
-        print(f"{char}: {count} times ({percentage:.2f}%)")
-    
-    # Print summary
-    print("\nSummary:")
+from nacl.bindings import crypto_sign_seed_keypair
+from tqdm import tqdm
+import argparse
+import json
+import math
+import multiprocessing as mp
+import os
+import queue
+import signal
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from algorandVanity_0_1_0 import (ALGORAND_ADDRESS_LENGTH, BASE32_ALPHABET, SEED_LENGTH, address_checksum,
+                                  address_codes, available_cpus, np)
+
+CHUNK_SIZE = 65536  # Addresses a worker counts before sending its histogram to the parent
+WRITE_INTERVAL = 10  # Seconds between incremental result writes
+SIGNIFICANCE = 1e-6  # p-value below which a position is flagged as not uniform
+
+def count_symbols(count):
+    """Generate `count` random addresses and return a (58, 32) histogram of their symbols."""
+    block = os.urandom(SEED_LENGTH * count)
+    raw = b"".join([public_key + address_checksum(public_key)
+                    for public_key in (crypto_sign_seed_keypair(block[i:i + SEED_LENGTH])[0]
+                                       for i in range(0, len(block), SEED_LENGTH))])
+    codes = address_codes(np.frombuffer(raw, dtype=np.uint8).reshape(-1, 36))
+    # Offset each position's codes so one bincount fills the whole table
+    flat = codes.astype(np.int64) + np.arange(ALGORAND_ADDRESS_LENGTH) * len(BASE32_ALPHABET)
+    return np.bincount(flat.ravel(), minlength=ALGORAND_ADDRESS_LENGTH * len(BASE32_ALPHABET)).reshape(
+        ALGORAND_ADDRESS_LENGTH, len(BASE32_ALPHABET))
+
+def stats_worker(count, chunk_size, result_queue):
+    """Worker process: count symbols chunk by chunk, sending each chunk's histogram to the parent."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    done = 0
+    while done < count:
+        size = min(chunk_size, count - done)
+        result_queue.put((size, count_symbols(size)))
+        done += size
+    result_queue.put(None)
+
+def chi_square_p_value(statistic, df):
+    """Chance of a chi-square statistic at least this large, the regularised upper incomplete gamma Q(df/2, x/2)."""
+    a = df / 2
+    x = statistic / 2
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        # Series for the lower function P, then Q = 1 - P
+        term = total = 1 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1 - total * math.exp(log_prefix))
+
+    # Continued fraction for Q (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefix) * h
+
+def position_stats(counts):
+    """Return chi-square uniformity results for every position of a (58, 32) histogram."""
+    results = []
+    for position, row in enumerate(counts):
+        total = int(row.sum())
+        expected = total / len(BASE32_ALPHABET)
+        statistic = float(((row - expected) ** 2).sum() / expected) if total else 0.0
+        df = len(BASE32_ALPHABET) - 1
+        p_value = chi_square_p_value(statistic, df)
+        seen = [BASE32_ALPHABET[code] for code in np.flatnonzero(row)]
+        results.append({
+            "position": position,
+            "symbols_seen": len(seen),
+            "chi_square": statistic,
+            "p_value": p_value,
+            # A position is constrained when some symbols never appear or the counts are far from uniform
+            "constrained": bool(total) and (len(seen) < len(BASE32_ALPHABET) or p_value < SIGNIFICANCE),
+            "seen": "".join(seen) if len(seen) < len(BASE32_ALPHABET) else None,
+        })
+    return results
+
+def write_results(filename, counts, total):
+    """Atomically write the histogram and per-position statistics as JSON."""
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'w') as f:
+        json.dump({
+            "addresses": total,
+            "alphabet": BASE32_ALPHABET,
+            "counts": counts.tolist(),
+            "positions": position_stats(counts),
+        }, f)
+    os.replace(temp_filename, filename)
+
+def load_results(filename):
+    """Load the histogram from a results file, to carry on adding to it."""
+    with open(filename, 'r') as f:
+        data = json.load(f)
+    return np.array(data["counts"], dtype=np.int64), data["addresses"]
+
+def analyze_positions(total, workers=1, output=None, resume=False, chunk_size=CHUNK_SIZE,
+                      write_interval=WRITE_INTERVAL):
+    """Count every symbol at every address position over `total` new addresses.
+
+    Workers send one small histogram per chunk, so memory stays the same however many
+    addresses are sampled. With an output file, results are rewritten every
+    `write_interval` seconds, and a resumed run adds to the counts already there.
+    Returns the (58, 32) histogram and the number of addresses it covers.
+    """
+    counts = np.zeros((ALGORAND_ADDRESS_LENGTH, len(BASE32_ALPHABET)), dtype=np.int64)
+    counted = 0
+    if resume and output and os.path.exists(output):
+        counts, counted = load_results(output)
+        print(f"Adding to the {counted:,} addresses already counted in '{output}'")
+
+    result_queue = mp.Queue()
+    share, extra = divmod(total, workers)
+    processes = [mp.Process(target=stats_worker, args=(share + (1 if i < extra else 0), chunk_size, result_queue),
+                            daemon=True)
+                 for i in range(workers) if share or i < extra]
+    for process in processes:
+        process.start()
+
+    last_write = time.monotonic()
+    running = len(processes)
+    try:
+        with tqdm(total=total, desc="Counting symbols", unit="addr") as pbar:
+            while running:
+                try:
+                    message = result_queue.get(timeout=1)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        break
+                    continue
+                if message is None:
+                    running -= 1
+                    continue
+                size, chunk_counts = message
+                counts += chunk_counts
+                counted += size
+                pbar.update(size)
+                if output and time.monotonic() - last_write >= write_interval:
+                    write_results(output, counts, counted)
+                    last_write = time.monotonic()
+    except KeyboardInterrupt:
+        print("\nStopped early, reporting what was counted so far.")
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+        if output:
+            write_results(output, counts, counted)
+    return counts, counted
+
+def display_character_frequencies(title, row, total):
+    """Print how often each symbol appeared at one position."""
+    print(f"\n{title}:")
     print("-" * 50)
-    print(f"Total characters found: {len(first_chars)}")
-    print(f"Expected count per character if uniform: {total/32:.1f}")
-    print("\nFound characters:", ", ".join(sorted(first_chars.keys())))
-    
-    # Check if any valid characters are never seen
-    all_valid = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ234567")
-    missing = all_valid - set(first_chars.keys())
-    if missing:
-        print("\nMissing characters:", ", ".join(sorted(missing)))
-    else:
-        print("\nAll valid characters (A-Z, 2-7) appear as first characters")
-    
-    # Calculate deviation from expected uniform distribution
-    expected = total/32
-    max_deviation = max(abs(count - expected) for count in first_chars.values())
-    print(f"\nMaximum deviation from expected: {max_deviation:.1f} ({(max_deviation/expected)*100:.1f}%)")
+    for code in np.argsort(-row, kind="stable"):
+        if row[code]:
+            print(f"{BASE32_ALPHABET[code]}: {row[code]} times ({row[code] / total * 100:.3f}%)")
+
+def display_position_stats(counts, total):
+    """Print the chi-square results for every position and the constrained ones."""
+    stats = position_stats(counts)
+    print("\nPer-position uniformity (chi-square, 31 degrees of freedom):")
+    print("-" * 62)
+    print("| {:>8} | {:>7} | {:>12} | {:>10} | {:<9} |".format("Position", "Symbols", "Chi-square", "p-value", "Uniform"))
+    print("-" * 62)
+    for result in stats:
+        print("| {:>8} | {:>7} | {:>12.2f} | {:>10.2e} | {:<9} |".format(
+            result["position"] + 1, result["symbols_seen"], result["chi_square"], result["p_value"],
+            "NO" if result["constrained"] else "yes"))
+    print("-" * 62)
+
+    constrained = [result for result in stats if result["constrained"]]
+    if not constrained:
+        print(f"\nAll {ALGORAND_ADDRESS_LENGTH} positions look uniform over {total:,} addresses.")
+        return
+    print("\nConstrained positions:")
+    for result in constrained:
+        if result["seen"]:
+            print(f"  Position {result['position'] + 1}: only {result['symbols_seen']} characters appear: "
+                  f"{', '.join(result['seen'])}")
+        else:
+            print(f"  Position {result['position'] + 1}: all characters appear, but not uniformly "
+                  f"(p = {result['p_value']:.2e})")
+
+def main(total, workers, output, resume):
+    if np is None:
+        print("Error: This analysis needs numpy, install it with: pip install numpy")
+        return 1
+
+    print("Analyzing every character position of Algorand addresses...")
+    print(f"Checking {total:,} addresses with {workers} worker process(es)")
+    counts, counted = analyze_positions(total, workers, output, resume)
+    if not counted:
+        print("No addresses were counted.")
+        return 1
+
+    display_character_frequencies("First character frequencies", counts[0], counted)
+    display_character_frequencies("Last character frequencies", counts[-1], counted)
+    display_position_stats(counts, counted)
+    print(f"\nExpected count per character if uniform: {counted / len(BASE32_ALPHABET):.1f}")
+    if output:
+        print(f"Full results saved to '{output}'")
+    return 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Per-position character statistics of Algorand addresses")
+    parser.add_argument("--addresses", type=int, default=100_000,
+                        help="number of new addresses to sample (default: 100,000)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes (0 = one per available CPU, default: 1)")
+    parser.add_argument("--output", metavar="PATH",
+                        help=f"write the histograms and statistics to this JSON file every {WRITE_INTERVAL} seconds")
+    parser.add_argument("--resume", action="store_true",
+                        help="add to the counts already in --output instead of starting over")
+    args = parser.parse_args()
+    if args.addresses <= 0:
+        parser.error("--addresses must be a positive number")
+    if args.workers < 0:
+        parser.error("--workers must be 0 or a positive number")
+    if args.workers == 0:
+        args.workers = available_cpus()
+    if args.resume and not args.output:
+        parser.error("--resume needs --output")
+    return args
 
 if __name__ == "__main__":
-    analyze_first_character()
+    args = parse_args()
+    raise SystemExit(main(args.addresses, args.workers, args.output, args.resume))
@@ -0,0 +1,175 @@
+import argparse
+import base64
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import algorandVanity_0_1_0 as vanity
+from algosdk import account, encoding, mnemonic
+from tqdm import tqdm
+
+def plan_of(*patterns):
+    """Build a search plan from (position, terms, exclude_last) tuples."""
+    plan = vanity.SearchPlan()
+    for position, terms, exclude_last in patterns:
+        plan.add(position, terms, exclude_last)
+    return plan
+
+def pattern_sets():
+    """Search plans covering every position kind, plus a large mixed set."""
+    rng = random.Random(0)
+    mixed = []
+    for _ in range(100):
+        position = rng.choice("FBA")
+        term = "".join(rng.choice(vanity.BASE32_ALPHABET) for _ in range(rng.randint(4, 6)))
+        if position == "B":
+            term = term[:-1] + rng.choice(sorted(vanity.VALID_END_CHARS))
+        mixed.append((position, [term], False))
+
+    return {
+        "front": plan_of(("F", ["ALGO"], False)),
+        "back": plan_of(("B", ["ALGA"], False)),
+        "anywhere": plan_of(("A", ["ALGO"], False)),
+        "front_back": plan_of(("FB", ["AL", "GA"], False)),
+        "exclude_last": plan_of(("B", ["ALGO"], True)),
+        "mixed_5": plan_of(("F", ["ALGO"], False), ("FB", ["AL", "GA"], False), ("B", ["ALGA"], False),
+                           ("A", ["VANITY"], False), ("B", ["ZZZ"], True)),
+        "mixed_100": plan_of(*mixed),
+    }
+
+def time_stage(fn, items, repeat):
+    """Best of `repeat` runs of fn over every item, as seconds per item."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(items)
+
+def time_batches(fn, batches, repeat):
+    """Best of `repeat` runs of fn over every batch, as seconds per address."""
+    return time_stage(fn, batches, repeat) * len(batches) / sum(len(batch) for batch in batches)
+
+def run_benchmarks(count, repeat, loop_count):
+    results = []
+
+    def record(stage, seconds, pattern_set=None):
+        results.append({
+            "stage": stage,
+            "pattern_set": pattern_set,
+            "us_per_address": seconds * 1e6,
+            "addresses_per_sec": 1 / seconds,
+        })
+        label = f"{stage} [{pattern_set}]" if pattern_set else stage
+        print("| {:<40} | {:>10.2f} | {:>14,.0f} |".format(label, seconds * 1e6, 1 / seconds))
+
+    print("-" * 74)
+    print("| {:<40} | {:>10} | {:>14} |".format("Stage", "us/addr", "Addr/sec"))
+    print("-" * 74)
+
+    seeds = vanity.generate_seeds(count)
+    public_keys = vanity.nacl_public_keys(seeds)
+    addresses = [encoding.encode_address(public_key) for public_key in public_keys]
+    private_keys = [vanity.private_key_from_raw(seed, public_key) for seed, public_key in zip(seeds, public_keys)]
+
+    # Key generation
+    record("keygen algosdk.generate_account", time_stage(lambda _: account.generate_account(), range(count), repeat))
+    batches = [seeds[i:i + vanity.KEYGEN_BATCH] for i in range(0, count, vanity.KEYGEN_BATCH)]
+    record("seeds os.urandom block", time_batches(lambda batch: vanity.generate_seeds(len(batch)), batches, repeat))
+    for backend, keygen in sorted(vanity.KEYGEN_BACKENDS.items()):
+        record(f"keygen {backend} batch", time_batches(keygen, batches, repeat))
+
+    # Checksum and base32
+    record("checksum algosdk", time_stage(encoding.checksum, public_keys, repeat))
+    record("checksum hashlib", time_stage(vanity.address_checksum, public_keys, repeat))
+    record("base32 algosdk.encode_address", time_stage(encoding.encode_address, public_keys, repeat))
+    raw = [public_key + vanity.address_checksum(public_key) for public_key in public_keys]
+    record("base32 base64.b32encode", time_stage(base64.b32encode, raw, repeat))
+    bits = [vanity.address_bits(public_key) for public_key in public_keys]
+    record("base32 address_from_bits", time_stage(vanity.address_from_bits, bits, repeat))
+
+    if vanity.np is not None:
+        np = vanity.np
+        raw_batches = [raw[i:i + vanity.VECTOR_BATCH] for i in range(0, count, vanity.VECTOR_BATCH)]
+
+        def batch_codes_of(batch):
+            return vanity.address_codes(np.frombuffer(b"".join(batch), dtype=np.uint8).reshape(-1, 36))
+
+        record("base32 address_codes (NumPy)", time_batches(batch_codes_of, raw_batches, repeat))
+        batch_codes = [batch_codes_of(batch) for batch in raw_batches]
+
+    # Matching, for every pattern set
+    for name, plan in pattern_sets().items():
+        record("search_address", time_stage(lambda address: vanity.search_address(address, plan), addresses, repeat), name)
+        matcher = vanity.compile_matcher(plan)
+        record("match_public_key", time_stage(lambda public_key: vanity.match_public_key(public_key, matcher), public_keys, repeat), name)
+        if vanity.np is not None:
+            vector_matcher = vanity.compile_vector_matcher(plan)
+            record("match_codes (NumPy)", time_batches(lambda codes: vanity.match_codes(codes, vector_matcher), batch_codes, repeat), name)
+
+    # Per-hit and bookkeeping costs
+    record("mnemonic.from_private_key", time_stage(mnemonic.from_private_key, private_keys[:max(1, count // 10)], repeat))
+    with open(os.devnull, 'w') as devnull:
+        with tqdm(total=count * repeat, file=devnull, mininterval=0.1) as pbar:
+            record("tqdm update(1)", time_stage(lambda _: pbar.update(1), range(count), repeat))
+
+    # The whole search loop, no prompts, no match output
+    for name, plan in pattern_sets().items():
+        for vectorized in ([False, True] if vanity.np is not None else [False]):
+            start = time.perf_counter()
+            checked, _, _ = vanity.run_search(loop_count, plan, progress=False, display_matches=False,
+                                              vectorized=vectorized)
+            stage = "run_search vectorized" if vectorized else "run_search"
+            record(stage, (time.perf_counter() - start) / checked, name)
+
+    print("-" * 74)
+    return results
+
+def compare(results, previous_file):
+    """Print how each stage changed against a previous results file."""
+    with open(previous_file, 'r') as f:
+        previous = {(r["stage"], r["pattern_set"]): r for r in json.load(f)["results"]}
+
+    print("\nCompared with", previous_file)
+    print("-" * 74)
+    print("| {:<40} | {:>10} | {:>14} |".format("Stage", "Before", "Change"))
+    print("-" * 74)
+    for result in results:
+        before = previous.get((result["stage"], result["pattern_set"]))
+        if not before:
+            continue
+        change = result["addresses_per_sec"] / before["addresses_per_sec"] - 1
+        label = f"{result['stage']} [{result['pattern_set']}]" if result["pattern_set"] else result["stage"]
+        print("| {:<40} | {:>10.2f} | {:>+13.1%} |".format(label, before["us_per_address"], change))
+    print("-" * 74)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time every stage of the vanity address pipeline")
+    parser.add_argument("--count", type=int, default=20_000, help="addresses per stage (default: 20000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, the best is kept (default: 3)")
+    parser.add_argument("--loop-count", type=int, default=20_000,
+                        help="addresses searched by each whole-loop run (default: 20000)")
+    parser.add_argument("--output", metavar="PATH", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a previous --output file")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.count, args.repeat, args.loop_count)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "count": args.count,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
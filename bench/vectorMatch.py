@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from algorandVanity_0_1_0 import (
+    BASE32_ALPHABET, SearchPlan, address_codes, compile_vector_matcher, match_codes, search_address,
+)
+
+# One pattern of every kind, so both paths do comparable work
+PATTERNS = SearchPlan()
+PATTERNS.add("F", ["ALGO"])
+PATTERNS.add("FB", ["AB", "YA"])
+PATTERNS.add("B", ["7QA"], exclude_last=True)
+PATTERNS.add("A", ["VANITY"])
+
+def vector_match(rows, batch):
+    print(f"Comparing scalar search_address with the NumPy matcher on {rows:,} addresses")
+    rng = np.random.default_rng(0)
+    raw = rng.integers(0, 256, size=(rows, 36), dtype=np.uint8)
+    raw[:, -1] &= 0xFC  # Keep the last symbol a valid end character, like a real checksum
+
+    alphabet = np.array(list(BASE32_ALPHABET))
+    addresses = ["".join(row) for row in alphabet[address_codes(raw)]]
+
+    start = time.perf_counter()
+    scalar_hits = sum(search_address(address, PATTERNS)[0] for address in addresses)
+    scalar_time = time.perf_counter() - start
+
+    vector_matcher = compile_vector_matcher(PATTERNS)
+    start = time.perf_counter()
+    vector_hits = 0
+    for offset in range(0, rows, batch):
+        vector_hits += len(match_codes(address_codes(raw[offset:offset + batch]), vector_matcher))
+    vector_time = time.perf_counter() - start
+
+    print("-" * 52)
+    print("| {:<14} | {:>8} | {:>9} | {:>10} |".format("Path", "Seconds", "Addr/sec", "Hits"))
+    print("-" * 52)
+    print("| {:<14} | {:>8.2f} | {:>9,.0f} | {:>10,} |".format("search_address", scalar_time, rows / scalar_time, scalar_hits))
+    print("| {:<14} | {:>8.2f} | {:>9,.0f} | {:>10,} |".format("NumPy", vector_time, rows / vector_time, vector_hits))
+    print("-" * 52)
+    print(f"Speedup: {scalar_time / vector_time:.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark NumPy batch matching against the scalar matcher")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=65_536)
+    args = parser.parse_args()
+    vector_match(args.rows, args.batch)
@@ -0,0 +1,54 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from algorandVanity_0_1_0 import (
+    BASE32_ALPHABET, VALID_END_CHARS, SearchPlan, compile_matcher, match_public_key, nacl_public_keys, generate_seeds,
+)
+
+def random_wordlist(count, rng):
+    """Build a front and back search plan for `count` random words of 4 to 8 characters."""
+    plan = SearchPlan()
+    for _ in range(count):
+        word = "".join(rng.choice(BASE32_ALPHABET) for _ in range(rng.randint(4, 8)))
+        plan.add("F", [word])
+        if word[-1] in VALID_END_CHARS:
+            plan.add("B", [word])
+    return plan
+
+def wordlist_scaling(sizes, sample):
+    print("Measuring matcher cost against wordlist size")
+    print(f"Matching {sample:,} pre-generated public keys per wordlist")
+    print("-" * 62)
+    print("| {:>9} | {:>10} | {:>14} | {:>16} |".format("Words", "Compile s", "Match addr/s", "With keygen/s"))
+    print("-" * 62)
+
+    rng = random.Random(0)
+    public_keys = nacl_public_keys(generate_seeds(sample))
+    start = time.perf_counter()
+    nacl_public_keys(generate_seeds(sample))
+    keygen_time = time.perf_counter() - start
+
+    for size in sizes:
+        start = time.perf_counter()
+        matcher = compile_matcher(random_wordlist(size, rng))
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for public_key in public_keys:
+            match_public_key(public_key, matcher)
+        match_time = time.perf_counter() - start
+
+        print("| {:>9,} | {:>10.2f} | {:>14,.0f} | {:>16,.0f} |".format(
+            size, compile_time, sample / match_time, sample / (match_time + keygen_time)))
+    print("-" * 62)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show that per-address matching cost stays flat as the wordlist grows")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1_000, 10_000, 100_000])
+    parser.add_argument("--sample", type=int, default=50_000)
+    args = parser.parse_args()
+    wordlist_scaling(args.sizes, args.sample)
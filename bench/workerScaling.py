@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from algorandVanity_0_1_0 import SearchPlan, run_search
+
+# A 10 character front term will practically never match, so every run does the same work
+NEVER_MATCHES = SearchPlan()
+NEVER_MATCHES.add("F", ["AAAAAAAAAA"])
+
+def measure(workers, per_worker):
+    """Time one search with `workers` processes and return addresses per second."""
+    total = per_worker * workers
+    start = time.perf_counter()
+    checked, _, _ = run_search(total, NEVER_MATCHES, workers=workers, progress=False)
+    return checked / (time.perf_counter() - start)
+
+def worker_scaling(max_workers, per_worker):
+    print("Measuring worker pool scaling")
+    print(f"Checking {per_worker:,} addresses per worker")
+    print("-" * 50)
+    print("| {:>7} | {:>12} | {:>8} | {:>10} |".format("Workers", "Addr/sec", "Speedup", "Efficiency"))
+    print("-" * 50)
+
+    counts = sorted({1, max_workers} | {n for n in (2, 4, 8, 16, 32, 64) if n < max_workers})
+    baseline = None
+    for workers in counts:
+        rate = measure(workers, per_worker)
+        baseline = baseline or rate
+        speedup = rate / baseline
+        print("| {:>7} | {:>12,.0f} | {:>7.2f}x | {:>9.1f}% |".format(
+            workers, rate, speedup, speedup / workers * 100))
+    print("-" * 50)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure how search throughput scales with worker processes")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--per-worker", type=int, default=20_000)
+    args = parser.parse_args()
+    worker_scaling(args.max_workers, args.per_worker)
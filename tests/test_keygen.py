@@ -0,0 +1,23 @@
+import os
+import sys
+from unittest import mock
+
+import pytest
+from algosdk import account, encoding
+from nacl.signing import SigningKey
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from algorandVanity_0_1_0 import KEYGEN_BACKENDS, private_key_from_raw
+
+
+@pytest.mark.parametrize("backend", sorted(KEYGEN_BACKENDS))
+def test_backend_matches_generate_account(backend):
+    """Every backend must rebuild exactly what algosdk's generate_account() returns for the same seed."""
+    for _ in range(32):
+        seed = os.urandom(32)
+        with mock.patch.object(SigningKey, "generate", return_value=SigningKey(seed)):
+            expected_private_key, expected_address = account.generate_account()
+
+        public_key = KEYGEN_BACKENDS[backend]([seed])[0]
+        assert private_key_from_raw(seed, public_key) == expected_private_key
+        assert encoding.encode_address(public_key) == expected_address